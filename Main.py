@@ -1,37 +1,172 @@
 import pygame
 import sys
+import time
 from settings import *
 from state_manager import StateManager
 import settings_manager
+import song_library
 from ui.settings_menu import SettingsMenu
+from compositor import Compositor, TextureCompositor
+import hitsounds
+
+# Longest stretch of real time the fixed-step loop will try to catch up on at once,
+# so a long stall (window drag, breakpoint) doesn't trigger thousands of updates.
+MAX_FRAME_TIME_MS = 250
+
+# States built once the first frame is up, while the main menu is idle, so entering them doesn't stall
+PREWARM_STATES = ("SONG_SELECT", "LOADING", "GAMEPLAY", "RESULTS")
 
 
 class Game:
     def __init__(self):
+        # --- Load and Apply Settings (the mixer setup has to be known before pygame.init) ---
+        settings_manager.load_settings()
+        song_library.load_library()
+        hitsounds.init_mixer()
         pygame.init()
         pygame.mixer.init()
-
-        # --- Load and Apply Settings ---
-        settings_manager.load_settings()
-
-        self.screen = pygame.display.set_mode(SCREEN_SIZE)
-        pygame.display.set_caption("BLOOMIFY")
+        settings_manager.apply_volume()
+        self.loop_mode = settings_manager.SETTINGS.get("loop_mode", "variable")
+        self.simulation_rate = settings_manager.SETTINGS.get("simulation_rate", 1000)
+        self.render_rate = settings_manager.SETTINGS.get("render_rate", FPS)
+        self.vsync = settings_manager.SETTINGS.get("vsync", False)
+        self.show_frame_rates = settings_manager.SETTINGS.get("show_frame_rates", False)
+        self.idle_frame_rate = settings_manager.SETTINGS.get("idle_frame_rate", 10)
+
+        self.compositor = self.create_compositor()
         self.clock = pygame.time.Clock()
         self.dt = 0
         self.running = True
+        self.pending_events = []  # Events consumed while waiting in idle mode
+
+        # --- Achieved rates, refreshed once per second ---
+        self.measured_simulation_rate = 0
+        self.measured_render_rate = 0
+        self._tick_count = 0
+        self._frame_count = 0
+        self._rate_timer_start = time.perf_counter()
+        self.font_rates = pygame.font.Font(None, 24)
+        self.frame_rates_text = None  # (text, surface) last drawn by draw_frame_rates
 
         self.state_manager = StateManager()
         self.settings_menu = SettingsMenu()  # Create the settings overlay
+        self.first_frame_shown = False
+
+    def create_compositor(self):
+        options = {
+            "render_size": settings_manager.get_render_size(),
+            "native_text": settings_manager.SETTINGS.get("native_text", False),
+            "smooth_upscale": settings_manager.SETTINGS.get("smooth_upscale", False),
+        }
+        backend = settings_manager.SETTINGS.get("render_backend", "software")
+        if backend in ("texture", "texture_software"):
+            try:
+                return TextureCompositor(SCREEN_SIZE, accelerated=backend == "texture", vsync=self.vsync,
+                                         title="BLOOMIFY", **options)
+            except (ImportError, RuntimeError, pygame.error) as e:
+                print(f"Warning: Texture renderer unavailable ({e}). Falling back to software rendering.")
+
+        screen = self.create_display()
+        pygame.display.set_caption("BLOOMIFY")
+        return Compositor(screen, debug_blit_formats=settings_manager.SETTINGS.get("debug_blit_formats", False),
+                          **options)
+
+    def create_display(self):
+        if self.vsync:
+            try:
+                return pygame.display.set_mode(SCREEN_SIZE, pygame.SCALED, vsync=1)
+            except pygame.error as e:
+                print(f"Warning: VSync unavailable ({e}). Falling back to the frame rate cap.")
+                self.vsync = False
+        return pygame.display.set_mode(SCREEN_SIZE)
 
     def run(self):
+        if self.loop_mode == "fixed":
+            self.run_fixed_timestep()
+        else:
+            self.run_variable_timestep()
+
+    def run_variable_timestep(self):
+        """ One update per rendered frame, capped at the render rate. """
         while self.running:
-            self.dt = self.clock.tick(FPS)
+            if not self.is_animating():
+                self.wait_while_idle()
+                self.clock.tick()  # Discard the idle time so the wake-up frame doesn't jump
+            self.dt = self.clock.tick(0 if self.vsync else self.render_rate)
             self.get_events()
             self.update()
+            self._tick_count += 1
             self.draw()
 
+    def run_fixed_timestep(self):
+        """
+        Updates (input and judging) run at a fixed simulation rate independent of
+        rendering. Frames are drawn at the render rate (or on vsync) and told how far
+        the simulation is behind real time so they can interpolate.
+        """
+        step_ms = 1000.0 / self.simulation_rate
+        frame_ms = 0 if self.vsync or self.render_rate <= 0 else 1000.0 / self.render_rate
+        previous = time.perf_counter() * 1000.0
+        next_frame = previous
+        accumulator = 0.0
+
+        while self.running:
+            if not self.is_animating():
+                self.wait_while_idle()
+                # Discard the idle time, but run one step to handle whatever woke us
+                previous = time.perf_counter() * 1000.0 - step_ms
+
+            now = time.perf_counter() * 1000.0
+            accumulator += min(now - previous, MAX_FRAME_TIME_MS)
+            previous = now
+
+            while accumulator >= step_ms and self.running:
+                self.dt = step_ms
+                self.get_events()
+                self.update()
+                self._tick_count += 1
+                accumulator -= step_ms
+
+            if now >= next_frame:
+                self.draw(lag_ms=accumulator)
+                next_frame = max(next_frame + frame_ms, now)
+            else:
+                # Sleep until the next simulation tick or frame, whichever comes first
+                wait_ms = min(step_ms - accumulator, next_frame - now)
+                if wait_ms > 0:
+                    time.sleep(wait_ms / 1000.0)
+
+    def is_animating(self):
+        """ True if the frame on screen is changing and the loop must run at full rate. """
+        if self.settings_menu.is_active or self.settings_menu.is_animating:
+            return self.settings_menu.is_animating
+        return self.state_manager.is_animating()
+
+    def wait_while_idle(self):
+        """
+        Blocks until an event arrives or the next idle frame is due, so static menus
+        don't spin a CPU core. The event that woke us is handled by the next get_events.
+        Queued prewarm states are built first, one at a time, stopping at the first event.
+        """
+        while self.state_manager.build_prewarmed_state():
+            event = pygame.event.poll()
+            if event.type != pygame.NOEVENT:
+                self.pending_events.append(event)
+                return
+        if self.idle_frame_rate > 0:
+            event = pygame.event.wait(int(1000 / self.idle_frame_rate))
+        else:
+            event = pygame.event.wait()
+        if event.type != pygame.NOEVENT:
+            self.pending_events.append(event)
+
     def get_events(self):
-        for event in pygame.event.get():
+        events = self.pending_events + pygame.event.get()
+        self.pending_events = []
+        for event in events:
+            if self.compositor.is_scaled and hasattr(event, "pos"):
+                event = self.to_render_event(event)
+
             if event.type == pygame.QUIT:
                 self.running = False
 
@@ -46,6 +181,14 @@ class Game:
             else:
                 self.state_manager.get_event(event)
 
+    def to_render_event(self, event):
+        """ Returns a copy of a pointer event with its position mapped into render coordinates. """
+        attributes = dict(event.dict)
+        attributes["pos"] = self.compositor.to_render_coords(event.pos)
+        if "rel" in attributes:
+            attributes["rel"] = self.compositor.to_render_coords(event.rel)
+        return pygame.event.Event(event.type, attributes)
+
     def update(self):
         # Update the settings menu if active or animating
         if self.settings_menu.is_active or self.settings_menu.is_animating:
@@ -57,14 +200,45 @@ class Game:
         if self.state_manager.is_done():
             self.running = False
 
-    def draw(self):
+    def draw(self, lag_ms=0.0):
+        self.compositor.begin_frame()
+
         # Always draw the state first
-        self.state_manager.draw(self.screen)
+        self.state_manager.draw(self.compositor, lag_ms)
 
         # Draw the settings menu on top if active or animating
-        self.settings_menu.draw(self.screen)
-
-        pygame.display.flip()
+        self.settings_menu.draw(self.compositor)
+        self.compositor.present()
+
+        self._frame_count += 1
+        self.update_measured_rates()
+        if self.show_frame_rates:
+            self.draw_frame_rates()
+
+        self.compositor.flip()
+
+        if not self.first_frame_shown:
+            self.first_frame_shown = True
+            self.state_manager.prewarm(*PREWARM_STATES)
+
+    def update_measured_rates(self):
+        elapsed = time.perf_counter() - self._rate_timer_start
+        if elapsed >= 1.0:
+            self.measured_simulation_rate = self._tick_count / elapsed
+            self.measured_render_rate = self._frame_count / elapsed
+            self._tick_count = 0
+            self._frame_count = 0
+            self._rate_timer_start += elapsed
+
+    def draw_frame_rates(self):
+        text = f"{self.measured_render_rate:.0f} FPS / {self.measured_simulation_rate:.0f} Hz"
+        # The text changes about once a second; keeping the last surface lets its texture be reused.
+        # It stays out of the shared text cache, which every new reading would churn.
+        if self.frame_rates_text is None or self.frame_rates_text[0] != text:
+            self.frame_rates_text = (text, self.font_rates.render(text, True, WHITE))
+        text_surface = self.frame_rates_text[1]
+        text_rect = text_surface.get_rect(bottomleft=(10, SCREEN_HEIGHT - 10))
+        self.compositor.blit_output(text_surface, text_rect.topleft)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,16 @@
 import pygame
+import numpy as np
 import os
+from collections import OrderedDict
+import settings_manager
 
 # --- Caching Dictionaries ---
 IMAGE_CACHE = {}
 FONT_CACHE = {}
+FONT_SOURCES = {}  # font -> the load_font arguments that created it
+MASK_CACHE = {}
+TEXT_CACHE = OrderedDict()  # (font, text, color) -> rendered surface, least recently used first
+TEXT_CACHE_LIMIT = 256
 
 # --- Paths ---
 BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -11,6 +18,43 @@ FONT_PATH = os.path.join(BASE_PATH, "assets", "fonts")
 IMAGE_PATH = os.path.join(BASE_PATH, "assets", "images")
 
 
+def is_fully_opaque(surface):
+    """ Returns True if the surface has no per-pixel alpha or every pixel is fully opaque. """
+    if surface.get_masks()[3] == 0:
+        return True
+    return int(np.min(pygame.surfarray.pixels_alpha(surface))) == 255
+
+
+def optimize_surface(surface, rle=False):
+    """
+    Converts a cached surface to the display's pixel format so blits need no
+    per-frame conversion. Opaque surfaces drop their per-pixel alpha (convert()),
+    surfaces with transparency keep it (convert_alpha()). rle enables RLE
+    acceleration for static, mostly-transparent sprites that are never modified.
+    """
+    if surface is None or pygame.display.get_surface() is None:
+        return surface
+    if is_fully_opaque(surface):
+        return surface.convert()
+    optimized = surface.convert_alpha()
+    if rle:
+        optimized.set_alpha(255, pygame.RLEACCEL)
+    return optimized
+
+
+def get_slow_blit_reason(source, target):
+    """
+    Returns why blitting source onto target takes a slow path, or None if it doesn't.
+    Used by the debug blit-format check; the opacity test only runs for large surfaces.
+    """
+    if source.get_bitsize() != target.get_bitsize() or source.get_masks()[:3] != target.get_masks()[:3]:
+        return f"{source.get_bitsize()}-bit source needs conversion to the {target.get_bitsize()}-bit target"
+    is_large = source.get_width() * source.get_height() >= (target.get_width() * target.get_height()) // 4
+    if is_large and source.get_masks()[3] != 0 and is_fully_opaque(source):
+        return "fully opaque surface carries per-pixel alpha"
+    return None
+
+
 def scale_to_cover(image, target_size):
     """
     Scales an image to completely cover a target area while maintaining
@@ -37,11 +81,51 @@ def scale_to_cover(image, target_size):
     blit_pos_x = (target_width - scale_width) / 2
     blit_pos_y = (target_height - scale_height) / 2
     final_surface.blit(scaled_image, (blit_pos_x, blit_pos_y))
-    return final_surface
+    return optimize_surface(final_surface)
 
 
+def get_rounded_mask(size, radius):
+    """
+    Returns a shared white, rounded-rect alpha mask for the given size and radius.
+    Blit an image onto a copy of it with BLEND_RGBA_MIN to clip its corners.
+    """
+    cache_key = (int(size[0]), int(size[1]), int(radius))
+    if cache_key in MASK_CACHE:
+        return MASK_CACHE[cache_key]
+    mask = pygame.Surface(cache_key[:2], pygame.SRCALPHA)
+    pygame.draw.rect(mask, (255, 255, 255, 255), (0, 0, *cache_key[:2]), border_radius=cache_key[2])
+    MASK_CACHE[cache_key] = mask
+    return mask
+
 
-def load_font(font_name, size, bold=False, italic=False):
+def round_corners(image, radius):
+    """ Returns a copy of the image with its corners clipped to the given radius. """
+    if not image or radius <= 0:
+        return image
+    rounded = get_rounded_mask(image.get_size(), radius).copy()
+    rounded.blit(image, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
+    return optimize_surface(rounded, rle=True)
+
+
+def load_font(font_name, size, bold=False, italic=False, native=False):
+    """
+    Loads a font for a size given in design pixels. Fonts are scaled to the render
+    resolution unless native is set, which keeps them at output resolution.
+    """
+    font = _load_font_at(font_name, size if native else max(1, settings_manager.scaled(size)), bold, italic)
+    FONT_SOURCES.setdefault(font, (font_name, size, bold, italic))
+    return font
+
+
+def get_native_font(font):
+    """ Returns the output-resolution version of a font created by load_font. """
+    source = FONT_SOURCES.get(font)
+    if not source:
+        return font
+    return load_font(*source, native=True)
+
+
+def _load_font_at(font_name, size, bold=False, italic=False):
     cache_key = (font_name, size, bold, italic)
     if cache_key in FONT_CACHE:
         return FONT_CACHE[cache_key]
@@ -72,6 +156,23 @@ def load_font(font_name, size, bold=False, italic=False):
         return font
 
 
+def render_text(font, text, color):
+    """
+    Renders antialiased text through a shared cache, so labels showing the same text
+    in the same font and colour share one surface. Don't modify the result.
+    """
+    cache_key = (font, text, tuple(color))
+    surface = TEXT_CACHE.get(cache_key)
+    if surface is not None:
+        TEXT_CACHE.move_to_end(cache_key)
+        return surface
+    surface = font.render(text, True, color)
+    TEXT_CACHE[cache_key] = surface
+    if len(TEXT_CACHE) > TEXT_CACHE_LIMIT:
+        TEXT_CACHE.popitem(last=False)
+    return surface
+
+
 def get_image_path(image_name):
     png_path = os.path.join(IMAGE_PATH, f"{image_name}.png")
     jpg_path = os.path.join(IMAGE_PATH, f"{image_name}.jpg")
@@ -85,7 +186,7 @@ def load_image(path):
         return IMAGE_CACHE[path]
     if path and os.path.exists(path):
         try:
-            image = pygame.image.load(path).convert_alpha()
+            image = optimize_surface(pygame.image.load(path))
             IMAGE_CACHE[path] = image
             return image
         except pygame.error as e:
@@ -116,7 +217,7 @@ def create_blurred_background(image, size, passes=4):
     dark_overlay.fill((0, 0, 0, 150))
     blurred_surface.blit(dark_overlay, (0, 0))
 
-    return blurred_surface
+    return optimize_surface(blurred_surface)
 
 
 def get_dominant_color(image, default_color=(128, 128, 128), vibrant=False):
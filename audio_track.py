@@ -0,0 +1,120 @@
+import time
+import pygame
+from rate_audio import render_rate_audio
+
+_reserved_channel_count = 0
+
+
+def reserve_channels(count):
+    """
+    Reserves count more mixer channels and returns them. Reserved channels are never
+    picked by Sound.play, so previews and hitsounds can't cut each other off.
+    """
+    global _reserved_channel_count
+    first = _reserved_channel_count
+    _reserved_channel_count += count
+    if pygame.mixer.get_num_channels() < _reserved_channel_count + 8:
+        pygame.mixer.set_num_channels(_reserved_channel_count + 8)  # Keep some free for Sound.play
+    pygame.mixer.set_reserved(_reserved_channel_count)
+    return [pygame.mixer.Channel(i) for i in range(first, _reserved_channel_count)]
+
+
+class AudioTrack:
+    """
+    A song opened once and kept ready to play through pygame.mixer.music. render()
+    resamples it for its rate off the main thread; prepare() then loads it and primes playback (started silently and paused at the beginning), so
+    starting the song is an unpause instead of a decoder open. The mixer streams from
+    the file path, not a Python file object, so its audio thread never waits for the
+    GIL; the OS page cache keeps the reads fast.
+
+    The track also measures its start delay: the time from a play request until the
+    mixer reports the track advancing (music.get_pos) past where it was when play was
+    requested, minus the audio it has played since. Buffering in the output device
+    after the mixer is not included.
+    """
+
+    def __init__(self, path, rate=1.0):
+        self.path = path
+        self.rate = rate  # Other rates play a resampled copy from the rate cache
+        self.play_path = None  # The file actually played, set by render()
+        self.is_loaded = False
+        self.is_primed = False
+        self.play_requested_at = None
+        self.start_position_ms = 0  # music.get_pos() when play was requested
+        self.start_delay_ms = None
+
+    def render(self):
+        """
+        Renders the track at its rate if that isn't cached yet and returns the file to
+        play. This only touches the disk, never the mixer, so run it on a loading thread.
+        """
+        if self.play_path is None:
+            self.play_path = render_rate_audio(self.path, self.rate)
+        return self.play_path
+
+    def prepare(self):
+        """
+        Loads and primes the track, rendering it first if render() hasn't run yet.
+        This drives pygame.mixer.music, so call it on the main thread. Returns True on success.
+        """
+        try:
+            pygame.mixer.music.load(self.render())
+        except (OSError, ValueError, pygame.error) as e:
+            print(f"Warning: Could not load audio '{self.path}': {e}")
+            return False
+        self.is_loaded = True
+        self.prime()
+        return True
+
+    def prime(self):
+        """ Starts the track silently and pauses it at the beginning, ready for play(0). """
+        if not self.is_loaded:
+            return
+        volume = pygame.mixer.music.get_volume()
+        pygame.mixer.music.set_volume(0)
+        pygame.mixer.music.play()
+        pygame.mixer.music.pause()
+        pygame.mixer.music.set_volume(volume)
+        self.is_primed = True
+
+    def play(self, start=0.0):
+        """ Plays the track from start seconds and starts measuring the start delay. """
+        if not self.is_loaded:
+            return
+        self.play_requested_at = time.perf_counter()
+        self.start_delay_ms = None
+        if self.is_primed and start <= 0:
+            # Priming can leave the paused position a little past 0; measure from there
+            self.start_position_ms = max(0, pygame.mixer.music.get_pos())
+            pygame.mixer.music.unpause()
+        else:
+            self.start_position_ms = 0  # play() restarts get_pos from 0
+            try:
+                pygame.mixer.music.play(start=start)
+            except pygame.error as e:
+                print(f"Warning: Could not start the music at {start:.2f}s ({e}). Playing from the start.")
+                pygame.mixer.music.play()
+        self.is_primed = False
+
+    def pause(self):
+        pygame.mixer.music.pause()
+
+    def unpause(self):
+        pygame.mixer.music.unpause()
+
+    def stop(self):
+        pygame.mixer.music.stop()
+        self.is_primed = False
+        self.play_requested_at = None
+
+    def update(self):
+        """ Call once per frame after play(). Returns True on the frame the start delay is measured. """
+        if self.play_requested_at is None:
+            return False
+        advance = pygame.mixer.music.get_pos() - self.start_position_ms
+        if advance <= 0:
+            return False
+        elapsed_ms = (time.perf_counter() - self.play_requested_at) * 1000.0
+        self.start_delay_ms = max(0.0, elapsed_ms - advance)
+        self.play_requested_at = None
+        return True
@@ -0,0 +1,48 @@
+import threading
+
+
+class TaskRunner:
+    """
+    Runs a list of loading tasks, one after another, on a daemon worker thread so
+    the main loop keeps drawing. Each task is (name, function, weight); the weight
+    is the task's rough share of the total work and drives progress. Each function
+    is called with this runner's results dict, where every finished task's result is
+    stored under its name, so later tasks can build on earlier ones.
+
+    The main thread only reads progress, is_done and results.
+    """
+
+    def __init__(self, tasks):
+        self.tasks = list(tasks)
+        self.total_weight = sum(weight for _, _, weight in self.tasks) or 1
+        self.completed_weight = 0
+        self.results = {}
+        self.is_done = False
+        self.cancelled = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """ Skips any tasks that haven't started yet. """
+        self.cancelled = True
+
+    @property
+    def progress(self):
+        """ Fraction of the work done, from 0.0 to 1.0. """
+        return self.completed_weight / self.total_weight
+
+    def _run(self):
+        for name, function, weight in self.tasks:
+            if self.cancelled:
+                break
+            try:
+                self.results[name] = function(self.results)
+            except Exception as e:
+                # A failed task leaves None behind; the state decides what that means
+                print(f"Warning: Loading task '{name}' failed: {e}")
+                self.results[name] = None
+            self.completed_weight += weight
+        self.is_done = True
@@ -0,0 +1,78 @@
+"""
+Times UIManager name lookups against a depth-first search of the same layout.
+
+    python benchmark_name_lookup.py [layout.json] [rounds]
+
+Every element name in the layout is looked up rounds times both ways. The results are
+checked to match, including after children are added near the front of the tree.
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+import settings_manager
+from ui.ui_manager import UIManager
+from ui.ui_element import UIElement
+
+DEFAULT_LAYOUT = os.path.join("layouts", "Song_Select_Layout.json")
+
+
+def find_by_search(root, name):
+    """ The lookup the name index replaced: a depth-first search from the root. """
+    stack = [root]
+    while stack:
+        element = stack.pop()
+        if element.name == name:
+            return element
+        stack.extend(reversed(element.children))
+    return None
+
+
+def time_lookups(lookup, names, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for name in names:
+            lookup(name)
+    return (time.perf_counter() - start) * 1000
+
+
+def check_lookups(manager, names):
+    for name in names:
+        if manager.get_element_by_name(name) is not find_by_search(manager.root, name):
+            raise SystemExit(f"Lookup mismatch for '{name}'")
+
+
+def main():
+    layout = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LAYOUT
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    pygame.init()
+    settings_manager.load_settings()
+    manager = UIManager()
+    manager.load_layout(layout)
+    if not manager.root:
+        raise SystemExit(f"Could not load '{layout}'")
+
+    names = list(manager.name_index)
+    element_count = sum(len(elements) for elements in manager.name_index.values())
+    check_lookups(manager, names)
+
+    index_ms = time_lookups(manager.get_element_by_name, names, rounds)
+    search_ms = time_lookups(lambda name: find_by_search(manager.root, name), names, rounds)
+    lookups = len(names) * rounds
+    print(f"{layout}: {element_count} elements, {len(names)} names, {lookups} lookups")
+    print(f"  name index: {index_ms:8.1f} ms ({index_ms * 1000 / lookups:.3f} us per lookup)")
+    print(f"  tree search: {search_ms:8.1f} ms ({search_ms * 1000 / lookups:.3f} us per lookup)")
+
+    # Elements added under the first child come before same-named ones later in the tree
+    first = manager.root.children[0] if manager.root.children else manager.root
+    for name in names[-10:]:
+        UIElement(parent=first, name=name)
+    check_lookups(manager, names)
+    print("  lookups match the tree search, including after add_child")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+import os
+import weakref
+import pygame
+import asset_loader
+
+try:
+    from pygame._sdl2 import video
+except ImportError:  # Older pygame builds without the SDL2 render API
+    video = None
+
+# Layers are composited bottom to top and must be begun in this order each frame.
+LAYER_ORDER = ("background", "state_ui", "overlay", "settings_menu")
+
+BLENDMODE_BLEND = 1  # SDL_BLENDMODE_BLEND
+# Static surfaces smaller than this (e.g. beat lines) are blitted in software rather than
+# drawn as textures, where keeping the z-order could cost a frame upload each
+MIN_TEXTURE_AREA = 64 * 64
+
+
+class FrameSurface(pygame.Surface):
+    """
+    A render-resolution drawing target owned by a Compositor. Text drawn onto it
+    can be deferred to the compositor's native-resolution text pass.
+    """
+    compositor = None
+
+    @property
+    def native_text(self):
+        return self.compositor is not None and self.compositor.native_text
+
+    def queue_native_text(self, text_surface, render_pos):
+        self.compositor.queue_native_text(text_surface, render_pos)
+
+
+class TrackedFrameSurface(FrameSurface):
+    """
+    A FrameSurface that records the area drawn into it since it was last cleared, so the
+    texture compositor knows what a texture would cover without reading pixels back.
+    Blits and fills are recorded automatically; pygame.draw calls bypass Surface methods
+    and are recorded with utils.mark_drawn. Filling the whole surface with transparent
+    black clears it (only the drawn area is actually filled).
+    """
+    dirty_rect = None
+
+    def mark_dirty(self, rect):
+        rect = pygame.Rect(rect).clip(self.get_rect())
+        if not rect.width or not rect.height:
+            return
+        self.dirty_rect = rect if self.dirty_rect is None else self.dirty_rect.union(rect)
+
+    def is_dirty(self, rect=None):
+        return self.dirty_rect is not None and (rect is None or self.dirty_rect.colliderect(rect))
+
+    def clear(self):
+        if self.dirty_rect is not None:
+            super().fill((0, 0, 0, 0), self.dirty_rect)
+            self.dirty_rect = None
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        rect = super().blit(source, dest, area, special_flags)
+        self.mark_dirty(rect)
+        return rect
+
+    def blits(self, blit_sequence, doreturn=1):
+        rects = super().blits(blit_sequence, 1)
+        for rect in rects:
+            self.mark_dirty(rect)
+        return rects if doreturn else None
+
+    def fill(self, color, rect=None, special_flags=0):
+        if rect is None and not special_flags and pygame.Color(color) == (0, 0, 0, 0):
+            self.clear()
+            return self.get_rect()
+        filled = super().fill(color, rect, special_flags)
+        self.mark_dirty(filled)
+        return filled
+
+
+class FormatCheckingSurface(FrameSurface):
+    """
+    Debug drawing target that warns (once per source size and reason) whenever a
+    blit source is in a slow pixel format for it.
+    """
+    reported = set()
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        reason = asset_loader.get_slow_blit_reason(source, self)
+        if reason:
+            key = (source.get_size(), reason)
+            if key not in FormatCheckingSurface.reported:
+                FormatCheckingSurface.reported.add(key)
+                print(f"Warning: Slow blit of {source.get_width()}x{source.get_height()} surface: {reason}")
+        return super().blit(source, dest, area, special_flags)
+
+
+class Compositor:
+    """
+    Owns the frame's layers so states never allocate full-screen surfaces for fades
+    or overlays. A layer drawn at full opacity goes straight onto the frame; a layer
+    with alpha is drawn into a persistent SRCALPHA buffer (allocated once, cleared per
+    use) and blended when the next layer begins or the frame is presented. Dimming is
+    a shared black surface blitted with surface alpha.
+
+    With a render_size smaller than the target, everything is drawn into an internal
+    framebuffer that is upscaled to the target once per frame. native_text defers
+    text to a pass drawn at the target's resolution; to keep it in the right place
+    in the z-order, the frame is upscaled at each layer boundary that has text
+    pending and later layers are drawn into a transparent buffer blended on top.
+
+    With debug_blit_formats, layers are drawn into FormatCheckingSurfaces that flag
+    slow-format blits.
+    """
+
+    uses_textures = False
+
+    def __init__(self, target, render_size=None, native_text=False, smooth_upscale=False,
+                 debug_blit_formats=False):
+        self.output = target
+        self._init_layers(target.get_size(), render_size, native_text, smooth_upscale,
+                          FormatCheckingSurface if debug_blit_formats else FrameSurface)
+
+        if self.is_scaled or debug_blit_formats:
+            self.frame = self._create_surface(self.size)
+        else:
+            self.frame = target
+        self.current = self.frame  # Where full-opacity layers are drawn
+        self.segment_frame = None  # Render-size layer content drawn after a native text pass
+        self.upscaled_segment = None
+
+        self.dim_surface = pygame.Surface(self.size)
+        self.dim_surface.fill((0, 0, 0))
+        self.output_dim_surface = None
+
+    def _init_layers(self, output_size, render_size, native_text, smooth_upscale, surface_class):
+        """ Sets up the sizes and per-frame layer state shared by every backend. """
+        self.output_size = tuple(output_size)
+        self.size = tuple(render_size) if render_size else self.output_size
+        self.scale = self.size[0] / self.output_size[0]
+        self.is_scaled = self.size != self.output_size
+        self.native_text = native_text and self.is_scaled
+        self.smooth_upscale = smooth_upscale
+        self.surface_class = surface_class
+
+        self.buffers = {}
+        self.pending_layer = None  # (buffer, alpha) waiting to be blended onto the frame
+        self.layer_alpha = 255
+        self.text_queue = []  # (text_surface, render_pos, alpha) for the native text pass
+        self.frame_presented = False  # Whether the frame has been upscaled to the output yet
+
+    def _create_surface(self, size, flags=0):
+        surface = self.surface_class(size, flags)
+        surface.compositor = self
+        return surface
+
+    def to_render_coords(self, pos):
+        """ Maps an output-resolution position (e.g. the mouse) into render coordinates. """
+        return pos[0] * self.scale, pos[1] * self.scale
+
+    def begin_frame(self):
+        """ Resets per-frame state. Call before any state draws. """
+        self.current = self.frame
+        self.pending_layer = None
+        self.layer_alpha = 255
+        self.text_queue.clear()
+        self.frame_presented = False
+
+    def begin_layer(self, name, alpha=255, dim=0):
+        """
+        Starts drawing the named layer and returns the surface to draw into.
+        alpha fades the whole layer; dim darkens everything beneath it (0-255).
+        """
+        if name not in LAYER_ORDER:
+            raise KeyError(f"Unknown compositor layer '{name}'")
+        self._flush_pending_layer()
+        if self.text_queue or (dim > 0 and self.frame_presented):
+            self._present_segment(final=False)
+
+        if dim > 0:
+            self._dim(min(255, int(dim)))
+
+        self.layer_alpha = max(0, min(255, int(alpha)))
+        if alpha >= 255:
+            return self.current
+
+        buffer = self.buffers.get(name)
+        if buffer is None:
+            buffer = self._create_surface(self.size, pygame.SRCALPHA)
+            self.buffers[name] = buffer
+        buffer.fill((0, 0, 0, 0))
+        self.pending_layer = (buffer, self.layer_alpha)
+        return buffer
+
+    def queue_native_text(self, text_surface, render_pos):
+        """ Defers a text blit to the output-resolution pass, keeping the current layer's alpha. """
+        self.text_queue.append((text_surface, render_pos, self.layer_alpha))
+
+    def present(self):
+        """ Finishes the frame on the target surface. Call after the last layer has been drawn. """
+        self._flush_pending_layer()
+        if self.frame is not self.output:
+            self._present_segment(final=True)
+
+    def _dim(self, alpha):
+        if self.frame_presented:
+            if self.output_dim_surface is None:
+                self.output_dim_surface = pygame.Surface(self.output_size)
+                self.output_dim_surface.fill((0, 0, 0))
+            self.output_dim_surface.set_alpha(alpha)
+            self.output.blit(self.output_dim_surface, (0, 0))
+        else:
+            self.dim_surface.set_alpha(alpha)
+            self.current.blit(self.dim_surface, (0, 0))
+
+    def _flush_pending_layer(self):
+        if self.pending_layer:
+            buffer, alpha = self.pending_layer
+            if alpha > 0:
+                buffer.set_alpha(alpha)
+                self.current.blit(buffer, (0, 0))
+            self.pending_layer = None
+
+    def _present_segment(self, final):
+        """
+        Copies everything drawn so far to the output and draws the queued native text.
+        Unless this is the end of the frame, later layers continue in a cleared segment buffer.
+        """
+        if not self.frame_presented:
+            self._upscale(self.frame, self.output)
+            self.frame_presented = True
+            if self.segment_frame is None and not final:
+                self.segment_frame = self._create_surface(self.size, pygame.SRCALPHA)
+                self.upscaled_segment = pygame.Surface(self.output_size, pygame.SRCALPHA)
+        else:
+            self._upscale(self.segment_frame, self.upscaled_segment)
+            self.output.blit(self.upscaled_segment, (0, 0))
+
+        for text_surface, render_pos, alpha in self.text_queue:
+            if alpha <= 0:
+                continue
+            if alpha < 255:
+                text_surface.set_alpha(alpha)
+            self.output.blit(text_surface, (render_pos[0] / self.scale, render_pos[1] / self.scale))
+            if alpha < 255:
+                text_surface.set_alpha(255)
+        self.text_queue.clear()
+
+        if not final:
+            self.segment_frame.fill((0, 0, 0, 0))
+            self.current = self.segment_frame
+
+    def blit_output(self, source, dest):
+        """ Draws an output-resolution surface (e.g. a debug readout) over the finished frame. """
+        self.output.blit(source, dest)
+
+    def flip(self):
+        """ Shows the finished frame. """
+        pygame.display.flip()
+
+    def _upscale(self, source, dest):
+        if source.get_size() == dest.get_size():
+            dest.blit(source, (0, 0))
+        elif self.smooth_upscale:
+            pygame.transform.smoothscale(source, dest.get_size(), dest)
+        else:
+            pygame.transform.scale(source, dest.get_size(), dest)
+
+
+class TextureCompositor(Compositor):
+    """
+    Renderer backend built on pygame._sdl2. Static surfaces handed to draw_texture
+    (backgrounds, banners, cached sprites that are never modified once built) are
+    uploaded once and drawn as textures every frame; small ones are just blitted.
+    Everything else is still drawn in software, into a transparent render-size frame
+    whose drawn area is streamed to a texture whenever a texture has to go on top of
+    something already drawn there, and at the end of the frame. The frame and layer
+    buffers track their drawn area (TrackedFrameSurface), so none of this reads pixels
+    back. The renderer scales both to the window, so render_scale and the native text
+    pass need no software upscale.
+
+    accelerated=False forces SDL's software renderer, which works without a GPU;
+    SDL also falls back to it when no hardware renderer can be created.
+    """
+
+    uses_textures = True
+
+    def __init__(self, window_size, render_size=None, native_text=False, smooth_upscale=False,
+                 accelerated=True, vsync=False, title=""):
+        if video is None:
+            raise ImportError("pygame._sdl2 is not available")
+        # SDL reads this hint when each texture is created
+        os.environ["SDL_RENDER_SCALE_QUALITY"] = "linear" if smooth_upscale else "nearest"
+        self.window = video.Window(title, size=window_size)
+        self.renderer = video.Renderer(self.window, accelerated=-1 if accelerated else 0, vsync=vsync)
+        self.renderer.draw_blend_mode = BLENDMODE_BLEND
+
+        self.output = None
+        self._init_layers(window_size, render_size, native_text, smooth_upscale, TrackedFrameSurface)
+        self.frame = self._create_surface(self.size, pygame.SRCALPHA)
+        self.current = self.frame
+        self.frame_texture = video.Texture(self.renderer, self.size, streaming=True)
+        self.frame_texture.blend_mode = BLENDMODE_BLEND
+        self.textures = weakref.WeakKeyDictionary()  # Static surface -> its uploaded texture
+
+    def begin_frame(self):
+        super().begin_frame()
+        self.frame.clear()
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+
+    def draw_texture(self, source, dest):
+        """
+        Draws a static surface as a texture at a render-resolution position, keeping
+        the z-order of whatever was drawn in software beneath it. The surface's own
+        alpha and the current layer's alpha both apply.
+        """
+        if source.get_width() * source.get_height() < MIN_TEXTURE_AREA:
+            self.current.blit(source, dest)
+            return
+        rect = pygame.Rect(dest, source.get_size())
+        if self.current is not self.frame and self.current.is_dirty(rect):
+            # Move this layer's earlier drawing under the texture
+            self._merge_layer(self.current, self.layer_alpha)
+        if self.frame.is_dirty(rect):
+            self._flush_frame()
+
+        alpha = source.get_alpha()
+        alpha = (255 if alpha is None else alpha) * self.layer_alpha // 255
+        if alpha <= 0:
+            return
+        texture = self._get_texture(source)
+        if alpha < 255:
+            texture.blend_mode = BLENDMODE_BLEND
+        texture.alpha = alpha
+        texture.draw(dstrect=self._to_output_rect(rect))
+
+    def blit_output(self, source, dest):
+        """ Draws an output-resolution surface over the frame. Like draw_texture, source must not change. """
+        self._get_texture(source).draw(dstrect=pygame.Rect(dest, source.get_size()))
+
+    def flip(self):
+        self.renderer.present()
+
+    def _get_texture(self, source):
+        texture = self.textures.get(source)
+        if texture is None:
+            texture = video.Texture.from_surface(self.renderer, source)
+            self.textures[source] = texture
+        return texture
+
+    def _to_output_rect(self, rect):
+        if not self.is_scaled:
+            return rect
+        return pygame.Rect(round(rect.x / self.scale), round(rect.y / self.scale),
+                           round(rect.width / self.scale), round(rect.height / self.scale))
+
+    def _merge_layer(self, buffer, alpha):
+        """ Blends a layer buffer's drawn area onto the frame and clears it. """
+        if alpha > 0 and buffer.is_dirty():
+            buffer.set_alpha(alpha)
+            self.frame.blit(buffer, buffer.dirty_rect.topleft, buffer.dirty_rect)
+        buffer.clear()
+
+    def _flush_pending_layer(self):
+        if self.pending_layer:
+            self._merge_layer(*self.pending_layer)
+            self.pending_layer = None
+
+    def _flush_frame(self):
+        """ Streams the frame's drawn area to the renderer and starts a fresh transparent frame. """
+        if not self.frame.is_dirty():
+            return
+        rect = self.frame.dirty_rect
+        self.frame_texture.update(self.frame.subsurface(rect), rect)
+        self.frame_texture.draw(srcrect=rect, dstrect=self._to_output_rect(rect))
+        self.frame.clear()
+
+    def _dim(self, alpha):
+        self._flush_frame()
+        self.renderer.draw_color = (0, 0, 0, alpha)
+        self.renderer.fill_rect((0, 0, *self.output_size))
+
+    def _present_segment(self, final):
+        self._flush_frame()
+        self.frame_presented = True
+        for text_surface, render_pos, alpha in self.text_queue:
+            if alpha <= 0:
+                continue
+            texture = self._get_texture(text_surface)
+            texture.alpha = alpha
+            texture.draw(dstrect=(round(render_pos[0] / self.scale), round(render_pos[1] / self.scale),
+                                  *text_surface.get_size()))
+        self.text_queue.clear()
@@ -0,0 +1,47 @@
+import math
+import statistics
+import numpy as np
+import pygame
+from hitsounds import create_click_samples, make_sound
+
+OFFSET_TRIM = 0.2  # Fraction of taps dropped from each end for the trimmed mean and variance
+
+
+def summarize_offsets(errors_ms, trim=OFFSET_TRIM):
+    """
+    Summarizes tap timing errors in milliseconds (positive means late). The median and
+    the trimmed mean ignore stray taps; the variance and standard deviation of the kept
+    taps show how consistent they were, and so how far to trust the estimate.
+    Returns None if there are no taps.
+    """
+    if not errors_ms:
+        return None
+    ordered = sorted(errors_ms)
+    cut = int(len(ordered) * trim)
+    kept = ordered[cut:len(ordered) - cut] or ordered
+    variance = statistics.pvariance(kept)
+    return {
+        "count": len(ordered),
+        "median": statistics.median(ordered),
+        "trimmed_mean": statistics.fmean(kept),
+        "variance": variance,
+        "std_dev": math.sqrt(variance),
+    }
+
+
+def create_metronome(bpm, beats, meter=4):
+    """
+    Renders a metronome of beats clicks (the first of every bar accented) into a single
+    Sound, so every click lands on its exact sample rather than on a frame boundary.
+    Click i starts at i * 60 / bpm seconds into the sound.
+    """
+    frequency = pygame.mixer.get_init()[0]
+    beat_length = 60.0 / bpm
+    accent = create_click_samples(frequency=2000.0)
+    click = create_click_samples(frequency=1400.0)
+    samples = np.zeros(int((beats + 1) * beat_length * frequency), dtype=np.int16)
+    for beat in range(beats):
+        sample = accent if beat % meter == 0 else click
+        start = round(beat * beat_length * frequency)
+        samples[start:start + len(sample)] = sample
+    return make_sound(samples)
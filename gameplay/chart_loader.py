@@ -1,13 +1,29 @@
 import json
 from gameplay.note import Note
+from gameplay.timing import TimingPoint, ScrollVelocity
 
 
 class Chart:
     """ A simple container for all the data loaded from a beatmap file. """
 
-    def __init__(self, metadata, notes):
+    def __init__(self, metadata, notes, timing_points=None, scroll_velocities=None):
         self.metadata = metadata
         self.notes = notes
+        self.timing_points = timing_points or []  # BPM changes, sorted by time
+        self.scroll_velocities = scroll_velocities or []  # Scroll speed changes, sorted by time
+        self.rate = 1.0  # Playback rate the times below have been scaled for
+
+    def apply_rate(self, rate):
+        """ Rescales the chart for audio played rate times faster: times shrink by the rate, BPMs grow by it. """
+        for note in self.notes:
+            note.time /= rate
+            note.duration /= rate
+        for point in self.timing_points:
+            point.time /= rate
+            point.bpm *= rate
+        for velocity in self.scroll_velocities:
+            velocity.time /= rate
+        self.rate *= rate
 
 
 def load_chart(file_path):
@@ -31,9 +47,23 @@ def load_chart(file_path):
                 duration=note_data.get("duration", 0) / 1000.0
             ))
 
-        return Chart(metadata, notes)
+        # Optional timing data: [{"time": ms, "bpm": 180, "meter": 4}] and [{"time": ms, "multiplier": 0.5}].
+        # Charts without timing points get one from their "bpm" and optional "offset" (ms of the first beat).
+        timing_data = data.get("timing_points") or [{"time": data.get("offset", 0), "bpm": data.get("bpm", 0)}]
+        timing_points = sorted((TimingPoint(time=point["time"] / 1000.0, bpm=point["bpm"], meter=point.get("meter", 4))
+                                for point in timing_data if _is_positive_number(point.get("bpm"))),
+                               key=lambda p: p.time)
+        scroll_velocities = sorted((ScrollVelocity(time=sv["time"] / 1000.0, multiplier=sv["multiplier"])
+                                    for sv in data.get("scroll_velocities", [])),
+                                   key=lambda v: v.time)
+
+        return Chart(metadata, notes, timing_points, scroll_velocities)
 
-    except (FileNotFoundError, json.JSONDecodeError) as e:
+    except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
         print(f"Error loading chart '{file_path}': {e}")
         return None
 
+
+def _is_positive_number(value):
+    # Song folders may store "N/A" or similar in place of a BPM
+    return isinstance(value, (int, float)) and value > 0
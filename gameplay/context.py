@@ -1,24 +1,53 @@
 from collections import Counter
 import pygame
 from gameplay.chart_loader import Chart
+from gameplay.timing import ScrollTimeline, BeatGrid, get_dominant_bpm, TIMING_WINDOWS
+from settings import LANE_WIDTH, RECEPTOR_Y, NOTE_SPEED
 import settings_manager
 
 class GameContext:
     def __init__(self, chart: Chart, screen_rect: pygame.Rect):
         self.chart = chart
         self.notes = chart.notes if chart else []
-        self.start_time_offset = 0
         self.screen_rect = screen_rect
-        self.song_time = 0.0
-        self.score = 0
-        self.combo = 0
-        self.max_combo = 0
-        self.judgements = Counter(perfect=0, great=0, good=0, bad=0, miss=0)
-        self.hits = 0
+        # Note times are already scaled by the rate; the windows shrink with it, as if judged in song time
+        self.rate = chart.rate if chart else 1.0
+        self.timing_windows = {judgement: window / self.rate for judgement, window in TIMING_WINDOWS.items()}
+
+        # --- Playfield geometry in render pixels (settings values are at 1920x1080) ---
+        self.lane_width = settings_manager.scaled(LANE_WIDTH)
+        self.receptor_y = settings_manager.scaled(RECEPTOR_Y)
+        self.scroll_speed = NOTE_SPEED * 100 * settings_manager.get_render_scale()  # pixels per second at 1x
+        self.scroll_timeline = self.build_scroll_timeline()
+        self.beat_grid = BeatGrid(chart.timing_points if chart else [], self.scroll_timeline, self.get_end_time())
+        self.practice_mode = False
+        self.loop_range = None  # (start, end) song times of the practice loop, if one is set
+        self.hitsounds = None  # HitsoundEngine, set by the gameplay state
+        # Global plus per-song offset in seconds. Notes are judged and drawn this much later.
+        self.audio_offset = settings_manager.SETTINGS.get("audio_offset_ms", 0) / 1000.0
+        self.reset()
 
         # --- Load Keybinds ---
         self.key_map = self.load_keybinds()
 
+    def build_scroll_timeline(self):
+        """ Builds the chart's scroll timeline and stores every note's scroll position on it. """
+        timing_points = self.chart.timing_points if self.chart else []
+        scroll_velocities = self.chart.scroll_velocities if self.chart else []
+        timeline = ScrollTimeline(timing_points, scroll_velocities, get_dominant_bpm(timing_points, self.get_end_time()))
+        for note in self.notes:
+            note.position = timeline.position_at(note.time)
+            note.end_position = timeline.position_at(note.end_time)
+        return timeline
+
+    def get_render_position(self):
+        """ Returns the scroll position to draw at, including the fixed-timestep render lag. """
+        return self.scroll_timeline.position_at(self.get_chart_time() + self.render_lag)
+
+    def get_note_y(self, position, current_position):
+        """ Returns the on-screen y of a scroll position, given the playfield's current position. """
+        return self.receptor_y - (position - current_position) * self.scroll_speed
+
     def load_keybinds(self):
         """ Loads key names from settings and converts them to pygame key codes. """
         key_map = {}
@@ -33,6 +62,38 @@ class GameContext:
         return key_map
 
     # ... (rest of the GameContext code remains the same)
+    def reset(self):
+        """ Clears the clock and the score for a fresh attempt. Chart data and practice settings are kept. """
+        self.start_time_offset = 0
+        self.song_time = 0.0
+        self.render_lag = 0.0  # seconds of song time elapsed since the last update, for interpolation
+        self.reset_score()
+
+    def reset_score(self):
+        """ Clears the score, combo and judgement counts. """
+        self.score = 0
+        self.combo = 0
+        self.max_combo = 0
+        self.judgements = Counter(perfect=0, great=0, good=0, bad=0, miss=0)
+        self.hits = 0
+
+    def seek(self, song_time):
+        """
+        Moves the song clock to song_time; the music starts from there too. The score
+        restarts with it, so notes replayed after a seek or loop are never counted twice.
+        """
+        self.song_time = max(0.0, song_time)
+        self.start_time_offset = self.song_time
+        self.reset_score()
+
+    def get_chart_time(self):
+        """ Returns the song time shifted by the audio offset, which judging and drawing use. """
+        return self.song_time - self.audio_offset
+
+    def get_end_time(self):
+        """ Returns the time the last note ends. """
+        return max((note.end_time for note in self.notes), default=0.0)
+
     def update_time(self, dt_seconds):
         self.song_time += dt_seconds
         if self.song_time < 0:
@@ -51,5 +112,6 @@ class GameContext:
         elif accuracy >= 80: grade = "C"
         elif accuracy >= 70: grade = "D"
         else: grade = "F"
-        return {"score": self.score, "accuracy": accuracy, "grade": grade, "judgement_counts": self.judgements, "max_combo": self.max_combo}
+        return {"score": self.score, "accuracy": accuracy, "grade": grade, "judgement_counts": self.judgements, "max_combo": self.max_combo,
+                "rate": self.rate, "practice": self.practice_mode}
 
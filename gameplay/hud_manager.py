@@ -2,6 +2,8 @@ import pygame
 from settings import *
 from gameplay.context import GameContext
 from utils import draw_text
+from settings_manager import scaled
+import asset_loader
 
 class HUDManager:
     """
@@ -9,23 +11,49 @@ class HUDManager:
     """
     def __init__(self, context: GameContext):
         self.context = context
-        self.font_hud = pygame.font.Font(None, 48)
+        self.font_hud = asset_loader.load_font(None, 48)
+        self.font_practice = asset_loader.load_font(None, 32)
+        self.margin = scaled(40)
+        self.message = ""  # Short notice under the score, e.g. after changing the song offset
+        self.message_timer = 0.0
 
     def get_event(self, event):
         """ The HUD is not interactive, so this method is a placeholder. """
         pass
 
     def update(self, dt):
-        """ The HUD's data is read live from the context, so no updates are needed. """
-        pass
+        """ The HUD's data is read live from the context; only the message times out. """
+        self.message_timer = max(0.0, self.message_timer - dt / 1000.0)
+
+    def show_message(self, text, duration=2.0):
+        self.message = text
+        self.message_timer = duration
 
     def draw(self, surface):
         """ Draws the score and accuracy to the screen. """
         # --- Draw Score (Top Left) ---
         score_text = f"{self.context.score:07d}"
-        draw_text(surface, score_text, (40, 40), self.font_hud, WHITE, text_rect_origin='topleft')
+        draw_text(surface, score_text, (self.margin, self.margin), self.font_hud, WHITE, text_rect_origin='topleft')
 
         # --- Draw Accuracy (Top Right) ---
         accuracy = self.context.calculate_accuracy()
         acc_text = f"{accuracy:.2f}%"
-        draw_text(surface, acc_text, (self.context.screen_rect.right - 40, 40), self.font_hud, WHITE, text_rect_origin='topright')
+        draw_text(surface, acc_text, (self.context.screen_rect.right - self.margin, self.margin), self.font_hud, WHITE, text_rect_origin='topright')
+
+        if self.context.practice_mode:
+            self.draw_practice_info(surface)
+
+        if self.message_timer > 0:
+            alpha = int(255 * min(1.0, self.message_timer * 2))  # Fades out over the last half second
+            draw_text(surface, self.message, (self.margin, self.margin * 2.5), self.font_practice, WHITE,
+                      alpha=alpha, text_rect_origin='topleft')
+
+    def draw_practice_info(self, surface):
+        """ Draws the practice mode banner and the current loop, top centre. """
+        text = "PRACTICE"
+        loop_start, loop_end = self.context.loop_range or (None, None)
+        if loop_start is not None:
+            end_text = f"{loop_end:.1f}s" if loop_end is not None else "..."
+            text += f"  |  LOOP {loop_start:.1f}s - {end_text}"
+        draw_text(surface, text, (self.context.screen_rect.centerx, self.margin), self.font_practice,
+                  (255, 230, 80), text_rect_origin='midtop')
@@ -1,6 +1,8 @@
 import pygame
 from settings import *
 from gameplay.context import GameContext
+from settings_manager import scaled
+from utils import blit_static, mark_drawn
 
 # We can keep KEY_MAP here as it relates to lane input visualization
 KEY_MAP = {0: pygame.K_d, 1: pygame.K_f, 2: pygame.K_j, 3: pygame.K_k}
@@ -9,6 +11,9 @@ KEY_MAP = {0: pygame.K_d, 1: pygame.K_f, 2: pygame.K_j, 3: pygame.K_k}
 class LaneManager:
     def __init__(self, context: GameContext):
         self.context = context
+        self.playfield_bg = None
+        self.bar_line = None  # Line sprites for the beat grid, built with the playfield background
+        self.beat_line = None
 
     def get_event(self, event):
         pass  # The lane manager doesn't need to handle events directly
@@ -18,28 +23,51 @@ class LaneManager:
 
     def draw(self, surface):
         # Calculate playfield dimensions based on settings
-        playfield_width = LANE_WIDTH * LANES
+        lane_width = self.context.lane_width
+        playfield_width = lane_width * LANES
         playfield_rect = pygame.Rect(0, 0, playfield_width, self.context.screen_rect.height)
         playfield_rect.centerx = self.context.screen_rect.centerx
 
-        # Draw a semi-transparent background for the playfield
-        playfield_bg = pygame.Surface(playfield_rect.size, pygame.SRCALPHA)
-        playfield_bg.fill((0, 0, 0, 180))
-        surface.blit(playfield_bg, playfield_rect)
+        # Draw a semi-transparent background for the playfield (built once, reused every frame)
+        if self.playfield_bg is None or self.playfield_bg.get_size() != playfield_rect.size:
+            self.playfield_bg = pygame.Surface(playfield_rect.size, pygame.SRCALPHA)
+            self.playfield_bg.fill((0, 0, 0, 180))
+            self.bar_line = pygame.Surface((playfield_rect.width, max(1, scaled(3))), pygame.SRCALPHA)
+            self.bar_line.fill((255, 255, 255, 90))
+            self.beat_line = pygame.Surface((playfield_rect.width, max(1, scaled(1))), pygame.SRCALPHA)
+            self.beat_line.fill((255, 255, 255, 35))
+        blit_static(surface, self.playfield_bg, playfield_rect.topleft)
+        self.draw_beat_lines(surface, playfield_rect)
 
         # Draw lane separators
         for i in range(1, LANES):
-            x = playfield_rect.left + i * LANE_WIDTH
-            pygame.draw.line(surface, (255, 255, 255, 50), (x, 0), (x, self.context.screen_rect.height), 2)
+            x = playfield_rect.left + i * lane_width
+            mark_drawn(surface, pygame.draw.line(surface, (255, 255, 255, 50), (x, 0),
+                                                 (x, self.context.screen_rect.height), max(1, scaled(2))))
 
         # Draw note receptors
         keys_pressed = pygame.key.get_pressed()
         for i in range(LANES):
-            x = playfield_rect.left + (i + 0.5) * LANE_WIDTH
-            receptor_rect = pygame.Rect(0, 0, LANE_WIDTH, 10)
-            receptor_rect.center = (int(x), RECEPTOR_Y)
+            x = playfield_rect.left + (i + 0.5) * lane_width
+            receptor_rect = pygame.Rect(0, 0, lane_width, scaled(10))
+            receptor_rect.center = (int(x), self.context.receptor_y)
 
             # Light up the receptor if the corresponding key is pressed
             color = (255, 255, 255, 200) if keys_pressed[KEY_MAP[i]] else (255, 255, 255, 100)
-            pygame.draw.rect(surface, color, receptor_rect, border_radius=3)
+            mark_drawn(surface, pygame.draw.rect(surface, color, receptor_rect, border_radius=scaled(3)))
 
+
+    def draw_beat_lines(self, surface, playfield_rect):
+        """ Draws the bar and beat lines currently on screen, found by binary search in the beat grid. """
+        grid = self.context.beat_grid
+        if not grid.positions:
+            return
+        current_position = self.context.get_render_position()
+        # Scroll positions at the bottom and top edges of the screen
+        low = current_position - (self.context.screen_rect.height - self.context.receptor_y) / self.context.scroll_speed
+        high = current_position + self.context.receptor_y / self.context.scroll_speed
+        start, stop = grid.get_visible_range(low, high)
+        for i in range(start, stop):
+            line = self.bar_line if grid.is_bar[i] else self.beat_line
+            y = self.context.get_note_y(grid.positions[i], current_position)
+            blit_static(surface, line, (playfield_rect.left, int(y - line.get_height() / 2)))
@@ -11,6 +11,8 @@ class Note:
 
         # --- Gameplay State ---
         self.y_pos = 0
+        self.position = time  # Scroll positions of the head and tail, set from the chart's ScrollTimeline
+        self.end_position = time + duration
         self.is_hit = False
         self.is_missed = False
         self.is_held = False  # True if the player is currently holding this note
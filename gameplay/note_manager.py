@@ -1,10 +1,12 @@
+from bisect import bisect_left
 import pygame
 from settings import *
 from gameplay.context import GameContext
 from gameplay.note import Note
-from utils import draw_text
+from utils import draw_text, mark_drawn
+from settings_manager import scaled
+import asset_loader
 
-TIMING_WINDOWS = {"perfect": 22, "great": 45, "good": 90, "bad": 120, "miss": 150}
 JUDGEMENT_COLORS = {"perfect": (80, 220, 255), "great": (100, 255, 100), "good": (255, 230, 80), "bad": (255, 100, 80),
                     "miss": (200, 200, 200)}
 HOLD_NOTE_COLOR = (200, 200, 255)
@@ -15,13 +17,21 @@ HELD_NOTE_COLOR = (255, 255, 255)
 class NoteManager:
     def __init__(self, context: GameContext):
         self.context = context
-        self.notes_to_spawn = sorted(self.context.notes, key=lambda n: n.time)
+        # Sorted by time, and so by scroll position too (positions never decrease)
+        self.notes = sorted(self.context.notes, key=lambda n: n.time)
+        self.note_times = [note.time for note in self.notes]
+        self.next_spawn_index = 0  # Notes before this index have been spawned
         self.active_notes = []
         # --- Use dynamic key map from context ---
         self.key_map = self.context.key_map
 
-        self.font_judgement = pygame.font.Font(None, 48)
-        self.font_combo = pygame.font.Font(None, 64)
+        self.font_judgement = asset_loader.load_font(None, 48)
+        self.font_combo = asset_loader.load_font(None, 64)
+
+        # --- Note geometry in render pixels ---
+        self.note_height = scaled(20)
+        self.despawn_margin = scaled(200)  # How far past the bottom edge notes are kept
+        self.combo_offset = scaled(100)
         # ... (rest of __init__ remains the same)
         self.judgement_text = ""
         self.judgement_alpha = 0
@@ -40,56 +50,86 @@ class NoteManager:
 
     def update(self, dt):
         dt_seconds = dt / 1000.0
-        spawn_window = (self.context.screen_rect.height / (NOTE_SPEED * 100))
-        while self.notes_to_spawn and self.notes_to_spawn[0].time <= self.context.song_time + spawn_window:
-            self.active_notes.append(self.notes_to_spawn.pop(0))
+        chart_time = self.context.get_chart_time()
+        current_position = self.context.scroll_timeline.position_at(chart_time)
+        # Culling is done on the scroll-position axis, so speed changes are accounted for
+        spawn_position = current_position + self.context.screen_rect.height / self.context.scroll_speed
+        while self.next_spawn_index < len(self.notes) and self.notes[self.next_spawn_index].position <= spawn_position:
+            self.active_notes.append(self.notes[self.next_spawn_index])
+            self.next_spawn_index += 1
         keys_pressed = pygame.key.get_pressed()
         notes_to_remove = []
         for note in self.active_notes:
-            time_diff = self.context.song_time - note.time
+            time_diff = chart_time - note.time
             if not note.is_hit and not note.is_missed:
-                if time_diff * 1000 > TIMING_WINDOWS["miss"]:
+                if time_diff * 1000 > self.context.timing_windows["miss"]:
                     note.is_missed = True
                     self.break_combo()
             if note.is_held:
                 if not keys_pressed[self.key_map[note.lane]]:
                     note.is_held = False
                     self.break_combo()
-                elif self.context.song_time >= note.end_time:
+                elif chart_time >= note.end_time:
                     note.is_held = False
                     note.is_hit = True
                     self.context.score += 100
-            note.y_pos = (time_diff * (NOTE_SPEED * 100)) + RECEPTOR_Y
-            if note.is_hit or note.y_pos > self.context.screen_rect.height + 200:
+            note.y_pos = self.context.get_note_y(note.position, current_position)
+            if note.is_hit or note.y_pos > self.context.screen_rect.height + self.despawn_margin:
                 notes_to_remove.append(note)
         self.active_notes = [n for n in self.active_notes if n not in notes_to_remove]
         if self.judgement_alpha > 0:
             self.judgement_alpha = max(0, self.judgement_alpha - (300 * dt_seconds))
 
+    def is_finished(self):
+        """ True once every note has been spawned and cleared from the playfield. """
+        return self.next_spawn_index >= len(self.notes) and not self.active_notes
+
+    def reset(self):
+        """ Puts every note back for a fresh attempt, without re-sorting or rebuilding anything. """
+        self.seek(0.0)
+
+    def seek(self, song_time):
+        """
+        Rebuilds the playfield for a jump to song_time. The first note still to come is
+        found by binary search; notes from there on get their hit state reset and are
+        spawned again by the next update.
+        """
+        index = bisect_left(self.note_times, song_time)
+        for note in self.notes[index:max(index, self.next_spawn_index)]:
+            note.is_hit = False
+            note.is_missed = False
+            note.is_held = False
+        self.next_spawn_index = index
+        self.active_notes = []
+        self.judgement_alpha = 0
+
     def draw(self, surface):
-        playfield_x_start = (self.context.screen_rect.width - (LANE_WIDTH * LANES)) / 2
+        lane_width = self.context.lane_width
+        receptor_y = self.context.receptor_y
+        playfield_x_start = (self.context.screen_rect.width - (lane_width * LANES)) / 2
+        current_position = self.context.get_render_position()
         for note in self.active_notes:
             if note.is_hit: continue
-            x = playfield_x_start + (note.lane + 0.5) * LANE_WIDTH
-            head_y = note.y_pos
+            x = playfield_x_start + (note.lane + 0.5) * lane_width
+            head_y = self.context.get_note_y(note.position, current_position)
             if note.duration > 0:
-                tail_end_y = ((self.context.song_time - note.end_time) * (NOTE_SPEED * 100)) + RECEPTOR_Y
+                tail_end_y = self.context.get_note_y(note.end_position, current_position)
                 rect_top = tail_end_y
                 rect_bottom = head_y
                 if note.is_held:
-                    rect_top = max(rect_top, RECEPTOR_Y)
+                    rect_top = max(rect_top, receptor_y)
                 rect_height = rect_bottom - rect_top
                 if rect_height > 0:
-                    tail_rect = pygame.Rect(0, 0, LANE_WIDTH - 10, rect_height)
+                    tail_rect = pygame.Rect(0, 0, lane_width - scaled(10), rect_height)
                     tail_rect.midtop = (int(x), int(rect_top))
                     tail_color = HELD_NOTE_COLOR if note.is_held else HOLD_NOTE_COLOR
-                    pygame.draw.rect(surface, tail_color, tail_rect, border_radius=5)
+                    mark_drawn(surface, pygame.draw.rect(surface, tail_color, tail_rect, border_radius=scaled(5)))
             if not note.is_held:
-                note_rect = pygame.Rect(0, 0, LANE_WIDTH - 4, 20)
+                note_rect = pygame.Rect(0, 0, lane_width - scaled(4), self.note_height)
                 note_rect.center = (int(x), int(head_y))
-                pygame.draw.rect(surface, WHITE, note_rect, border_radius=4)
+                mark_drawn(surface, pygame.draw.rect(surface, WHITE, note_rect, border_radius=scaled(4)))
         if self.context.combo > 2:
-            combo_pos = (self.context.screen_rect.centerx, self.context.screen_rect.centery - 100)
+            combo_pos = (self.context.screen_rect.centerx, self.context.screen_rect.centery - self.combo_offset)
             draw_text(surface, str(self.context.combo), combo_pos, self.font_combo, WHITE, text_rect_origin='center')
         if self.judgement_alpha > 0:
             judgement_pos = (self.context.screen_rect.centerx, self.context.screen_rect.centery)
@@ -98,10 +138,12 @@ class NoteManager:
                       text_rect_origin='center')
 
     def handle_hit(self, lane):
+        if self.context.hitsounds:
+            self.context.hitsounds.play("hit")  # Every press sounds, like the key of an instrument
         for note in self.active_notes:
             if not note.is_hit and not note.is_missed and note.lane == lane:
-                time_diff = abs(self.context.song_time - note.time) * 1000
-                for judgement, window in TIMING_WINDOWS.items():
+                time_diff = abs(self.context.get_chart_time() - note.time) * 1000
+                for judgement, window in self.context.timing_windows.items():
                     if time_diff <= window:
                         if judgement != "miss":
                             self.context.judgements[judgement] += 1
@@ -120,7 +162,7 @@ class NoteManager:
     def handle_release(self, lane):
         for note in self.active_notes:
             if note.is_held and note.lane == lane:
-                if self.context.song_time >= note.end_time:
+                if self.context.get_chart_time() >= note.end_time:
                     note.is_held = False
                     note.is_hit = True
                 else:
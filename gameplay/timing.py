@@ -0,0 +1,130 @@
+import math
+from bisect import bisect_left, bisect_right
+
+# Hit windows in milliseconds at 1x; GameContext scales them by the playback rate
+TIMING_WINDOWS = {"perfect": 22, "great": 45, "good": 90, "bad": 120, "miss": 150}
+
+
+class TimingPoint:
+    """
+    A BPM change. Its time (in seconds, like Note.time) is the offset of the section's
+    first beat, which also starts a bar; meter is the number of beats per bar.
+    """
+
+    def __init__(self, time, bpm, meter=4):
+        self.time = time
+        self.bpm = bpm
+        self.meter = meter
+
+    @property
+    def beat_length(self):
+        return 60.0 / self.bpm
+
+
+class ScrollVelocity:
+    """ A scroll speed multiplier that applies from its time until the next one. """
+
+    def __init__(self, time, multiplier):
+        self.time = time
+        self.multiplier = multiplier
+
+
+def get_dominant_bpm(timing_points, end_time):
+    """ Returns the BPM that is active for the longest stretch of the chart, used as 1x scroll speed. """
+    if not timing_points:
+        return None
+    durations = {}
+    for i, point in enumerate(timing_points):
+        next_time = timing_points[i + 1].time if i + 1 < len(timing_points) else max(end_time, point.time)
+        durations[point.bpm] = durations.get(point.bpm, 0.0) + (next_time - point.time)
+    return max(durations, key=durations.get)
+
+
+class ScrollTimeline:
+    """
+    Maps song time to scroll position, the distance (in seconds at 1x speed) the
+    playfield has scrolled. Scroll speed is piecewise constant: the active scroll
+    velocity multiplier times the active BPM relative to base_bpm. The position at
+    the start of every segment is precomputed, so position_at is a binary search
+    plus a multiply however many timing points the chart has.
+
+    Speeds are clamped at zero so positions never decrease, which lets callers cull
+    notes sorted by time on the position axis.
+    """
+
+    def __init__(self, timing_points=(), scroll_velocities=(), base_bpm=None):
+        timing_points = sorted(timing_points, key=lambda p: p.time)
+        scroll_velocities = sorted(scroll_velocities, key=lambda v: v.time)
+        if base_bpm is None and timing_points:
+            base_bpm = timing_points[0].bpm
+
+        bpm_times = [p.time for p in timing_points]
+        sv_times = [v.time for v in scroll_velocities]
+        change_times = sorted(set(bpm_times) | set(sv_times)) or [0.0]
+
+        self.times = []  # Start time of each segment
+        self.speeds = []  # Scroll speed multiplier during each segment
+        self.positions = []  # Scroll position at the start of each segment
+        # Speed before the first change: the first timing point's BPM, with no SV applied yet
+        self.lead_speed = 1.0
+        if timing_points and base_bpm:
+            self.lead_speed = max(0.0, timing_points[0].bpm / base_bpm)
+        position = 0.0
+        for time in change_times:
+            speed = 1.0
+            if timing_points and base_bpm:
+                # Before the first timing point its BPM applies
+                point = timing_points[max(0, bisect_right(bpm_times, time) - 1)]
+                speed = point.bpm / base_bpm
+            sv_index = bisect_right(sv_times, time) - 1
+            if sv_index >= 0:
+                speed *= scroll_velocities[sv_index].multiplier
+            speed = max(0.0, speed)
+
+            if self.times:
+                position += (time - self.times[-1]) * self.speeds[-1]
+            self.times.append(time)
+            self.speeds.append(speed)
+            self.positions.append(position)
+
+    def position_at(self, time):
+        """ Returns the scroll position at a song time (in seconds). """
+        if time < self.times[0]:
+            # Before the first change (including the lead-in before 0) only the BPM applies
+            return self.positions[0] + (time - self.times[0]) * self.lead_speed
+        index = bisect_right(self.times, time) - 1
+        return self.positions[index] + (time - self.times[index]) * self.speeds[index]
+
+
+class BeatGrid:
+    """
+    Every beat line of a chart, precomputed once from its timing points: the time,
+    scroll position and whether the beat starts a bar. Beats are counted from each
+    timing point; the first section is extended back to the start of the song.
+    Positions never decrease, so the lines in view are found by binary search.
+    """
+
+    def __init__(self, timing_points, timeline, end_time):
+        self.times = []
+        self.positions = []
+        self.is_bar = []
+        self.bar_times = []  # Times of the bar lines only, for seeking by bar
+
+        for i, point in enumerate(timing_points):
+            beat_length = point.beat_length
+            beat = -math.floor(point.time / beat_length) if i == 0 else 0
+            section_end = timing_points[i + 1].time if i + 1 < len(timing_points) else end_time
+            time = point.time + beat * beat_length
+            # The small margin keeps a beat landing on the next timing point from being doubled
+            while time < section_end - 1e-6:
+                self.times.append(time)
+                self.positions.append(timeline.position_at(time))
+                self.is_bar.append(beat % point.meter == 0)
+                if self.is_bar[-1]:
+                    self.bar_times.append(time)
+                beat += 1
+                time = point.time + beat * beat_length
+
+    def get_visible_range(self, low_position, high_position):
+        """ Returns the (start, stop) indices of the lines between two scroll positions. """
+        return bisect_left(self.positions, low_position), bisect_right(self.positions, high_position)
@@ -0,0 +1,125 @@
+import os
+import time
+import numpy as np
+import pygame
+import settings_manager
+from audio_track import reserve_channels
+
+HITSOUND_PATH = os.path.join("assets", "sounds", "hitsounds")
+HITSOUND_CHANNELS = 8  # Enough for fast streams and chords without cutting off a ringing sample
+
+
+def init_mixer():
+    """
+    Opens the mixer with the configured frequency and buffer size. Smaller buffers cut
+    the delay before a triggered sound is heard (one buffer is audio_buffer / frequency
+    seconds) at the cost of more callbacks and a higher risk of crackling. Must be
+    called before pygame.init().
+    """
+    frequency = settings_manager.SETTINGS.get("audio_frequency", 44100)
+    buffer = settings_manager.SETTINGS.get("audio_buffer", 256)
+    pygame.mixer.pre_init(frequency, -16, 2, buffer)
+
+
+class HitsoundEngine:
+    """
+    Plays hitsounds with as little work as possible on the hit itself. Every sample in
+    HITSOUND_PATH is decoded into a Sound up front (a synthesized click stands in for a
+    missing "hit"), and a fixed pool of reserved channels is taken in turn, so play()
+    is a dictionary lookup and a channel play with nothing allocated or decoded.
+
+    With log_audio_latency set, each play() call is also timed into a running total;
+    get_latency_report() combines that with the mixer's buffer length for the
+    key-to-sound figure.
+    """
+
+    def __init__(self, channel_count=HITSOUND_CHANNELS):
+        self.sounds = {}
+        self.channels = reserve_channels(channel_count) if pygame.mixer.get_init() else []
+        self.next_channel = 0
+        self.enabled = True
+        self.measure_latency = False
+        self.trigger_time_total = 0.0  # Seconds spent in timed play() calls
+        self.trigger_count = 0
+        if self.channels:
+            self.load_sounds()
+
+    def load_sounds(self):
+        if os.path.isdir(HITSOUND_PATH):
+            for file_name in sorted(os.listdir(HITSOUND_PATH)):
+                name, extension = os.path.splitext(file_name)
+                if extension.lower() not in (".wav", ".ogg", ".mp3"):
+                    continue
+                try:
+                    self.sounds[name] = pygame.mixer.Sound(os.path.join(HITSOUND_PATH, file_name))
+                except pygame.error as e:
+                    print(f"Warning: Could not load hitsound '{file_name}': {e}")
+        if "hit" not in self.sounds:
+            self.sounds["hit"] = create_click_sound()
+
+    def apply_settings(self):
+        """ Picks up the hitsound toggle and volume; call when gameplay starts. """
+        self.enabled = settings_manager.SETTINGS.get("hitsounds", True)
+        volume = settings_manager.SETTINGS.get("master_volume", 0.5) * settings_manager.SETTINGS.get("hitsound_volume", 0.8)
+        for sound in self.sounds.values():
+            sound.set_volume(volume)
+        self.measure_latency = settings_manager.SETTINGS.get("log_audio_latency", False)
+        self.trigger_time_total = 0.0
+        self.trigger_count = 0
+
+    def play(self, name="hit"):
+        if not self.enabled or not self.channels:
+            return
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+        channel = self.channels[self.next_channel]
+        self.next_channel = (self.next_channel + 1) % len(self.channels)
+        if not self.measure_latency:
+            channel.play(sound)
+            return
+        start = time.perf_counter()
+        channel.play(sound)
+        self.trigger_time_total += time.perf_counter() - start
+        self.trigger_count += 1
+
+    def get_latency_report(self):
+        """
+        Returns the mixer setup and the latency it implies, in milliseconds. The device
+        may add its own buffering on top; that part can't be measured from pygame.
+        """
+        frequency = pygame.mixer.get_init()[0] if pygame.mixer.get_init() else 0
+        buffer = settings_manager.SETTINGS.get("audio_buffer", 256)
+        buffer_ms = 1000.0 * buffer / frequency if frequency else 0.0
+        trigger_ms = 1000.0 * self.trigger_time_total / self.trigger_count if self.trigger_count else 0.0
+        return {
+            "frequency": frequency,
+            "buffer": buffer,
+            "buffer_ms": buffer_ms,
+            "trigger_ms": trigger_ms,
+            "hits": self.trigger_count,
+            # A sound waits for the next mixer callback (one buffer at worst) and then plays out
+            # of a buffer of the same length
+            "key_to_sound_ms": trigger_ms + 2 * buffer_ms,
+        }
+
+
+def create_click_samples(duration=0.04, frequency=2000.0):
+    """ Returns a short decaying click as mono 16-bit samples at the mixer's frequency. """
+    mixer_frequency = pygame.mixer.get_init()[0]
+    t = np.arange(int(duration * mixer_frequency)) / mixer_frequency
+    wave = np.sin(2 * np.pi * frequency * t) * np.exp(-t * 120)
+    return (wave * 0.6 * 32767).astype(np.int16)
+
+
+def make_sound(samples):
+    """ Turns mono 16-bit samples into a Sound, copied to every mixer channel. """
+    channels = pygame.mixer.get_init()[2]
+    if channels > 1:
+        samples = np.repeat(samples[:, None], channels, axis=1)
+    return pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+
+
+def create_click_sound():
+    """ The click used when no hit sample is installed. """
+    return make_sound(create_click_samples())
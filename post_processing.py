@@ -0,0 +1,104 @@
+import random
+import numpy as np
+import pygame
+
+
+class PostEffect:
+    """
+    Base class for full-screen effects applied to a surface after a state has
+    drawn its scene. Subclasses override apply().
+    """
+
+    def __init__(self):
+        self.enabled = True
+
+    def apply(self, surface):
+        pass
+
+
+class GlitchEffect(PostEffect):
+    """
+    Horizontal slice shifting and chromatic aberration, done in place on a
+    pygame.surfarray view with NumPy. Scratch buffers are allocated once per
+    surface size and reused every frame.
+    """
+
+    def __init__(self, max_slices=20, max_shift=60, max_split=15, split_threshold=0.2):
+        super().__init__()
+        self.intensity = 0.0  # 0.0 (off) to 1.0 (full glitch)
+        self.max_slices = max_slices
+        self.max_shift = max_shift
+        self.max_split = max_split
+        self.split_threshold = split_threshold
+
+        self._buffer_size = None
+        self._row_buffer = None
+        self._shift_buffer = None
+        self._headroom_buffer = None
+
+    def _ensure_buffers(self, size):
+        if self._buffer_size != size:
+            width, height = size
+            self._row_buffer = np.empty((20, width), dtype=np.uint32)
+            self._shift_buffer = np.empty((height, width), dtype=np.uint32)
+            self._headroom_buffer = np.empty((height, width * 4), dtype=np.uint8)
+            self._buffer_size = size
+
+    def apply(self, surface):
+        if self.intensity <= 0 or surface.get_bytesize() != 4:
+            return
+        width, height = surface.get_size()
+        self._ensure_buffers((width, height))
+
+        # surfarray is indexed (x, y); transposing gives row-major (y, x) packed pixels
+        pixels = pygame.surfarray.pixels2d(surface).T
+        try:
+            self._shift_slices(pixels, width, height)
+            if self.intensity > self.split_threshold:
+                offset = int(self.intensity * self.max_split)
+                red_mask, green_mask, blue_mask, _ = surface.get_masks()
+                # Red is added back shifted one way, green and blue (cyan) another.
+                self._add_shifted(pixels, red_mask, random.randint(-offset, offset), random.randint(-offset, offset))
+                self._add_shifted(pixels, green_mask | blue_mask, random.randint(-offset, offset),
+                                  random.randint(-offset, offset))
+        finally:
+            # Release the surface lock held by the pixel view
+            del pixels
+
+    def _shift_slices(self, pixels, width, height):
+        """ Moves random horizontal bands sideways, leaving the uncovered part as it was. """
+        max_shift = int(self.intensity * self.max_shift)
+        for _ in range(int(self.intensity * self.max_slices)):
+            h = random.randint(2, min(20, height))
+            y = random.randint(0, height - h)
+            shift = random.randint(-max_shift, max_shift)
+            if shift == 0 or abs(shift) >= width:
+                continue
+            band = self._row_buffer[:h]
+            band[...] = pixels[y:y + h]
+            if shift > 0:
+                pixels[y:y + h, shift:] = band[:, :width - shift]
+            else:
+                pixels[y:y + h, :width + shift] = band[:, -shift:]
+
+    def _add_shifted(self, pixels, channel_mask, dx, dy):
+        """
+        Saturating add of the masked channels onto the image, offset by (dx, dy),
+        equivalent to a BLEND_RGB_ADD blit of a colour-multiplied copy.
+        """
+        height, width = pixels.shape
+        if abs(dx) >= width or abs(dy) >= height:
+            return
+        dst = (slice(max(dy, 0), height + min(dy, 0)), slice(max(dx, 0), width + min(dx, 0)))
+        src = (slice(max(-dy, 0), height + min(-dy, 0)), slice(max(-dx, 0), width + min(-dx, 0)))
+
+        shifted = self._shift_buffer[dst]
+        np.bitwise_and(pixels[src], np.uint32(channel_mask), out=shifted)
+
+        # Work per byte: headroom = min(255 - dst, src), so dst + headroom never overflows
+        target = pixels[dst].view(np.uint8)
+        byte_dst = (dst[0], slice(dst[1].start * 4, dst[1].stop * 4))
+        headroom = self._headroom_buffer[byte_dst]
+        np.subtract(np.uint8(255), target, out=headroom)
+        np.minimum(headroom, shifted.view(np.uint8), out=headroom)
+        target += headroom
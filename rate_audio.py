@@ -0,0 +1,101 @@
+import os
+import hashlib
+import threading
+import wave
+import numpy as np
+import pygame
+
+RATE_MIN = 0.75
+RATE_MAX = 2.0
+RATE_STEP = 0.05
+RATE_CACHE_PATH = os.path.join("cache", "rates")
+RESAMPLE_CHUNK = 1 << 18  # Output frames resampled at a time, to bound the temporary arrays
+
+
+def clamp_rate(rate):
+    """ Snaps a rate to RATE_STEP within RATE_MIN - RATE_MAX. """
+    rate = min(max(rate, RATE_MIN), RATE_MAX)
+    return round(round(rate / RATE_STEP) * RATE_STEP, 2)
+
+
+def get_cache_file(audio_path, rate):
+    source = f"{os.path.abspath(audio_path)}|{os.path.getmtime(audio_path)}|{rate}|{pygame.mixer.get_init()}"
+    return os.path.join(RATE_CACHE_PATH, hashlib.sha1(source.encode("utf-8")).hexdigest() + ".wav")
+
+
+def is_rendered(audio_path, rate):
+    return rate == 1.0 or os.path.exists(get_cache_file(audio_path, rate))
+
+
+def render_rate_audio(audio_path, rate):
+    """
+    Returns the path of the song resampled to play rate times faster (and pitched up
+    with it), rendering it to the disk cache first if needed. This blocks for as long
+    as decoding and resampling take, so call it from a worker thread.
+    """
+    if rate == 1.0:
+        return audio_path
+    cache_file = get_cache_file(audio_path, rate)
+    if os.path.exists(cache_file):
+        return cache_file
+
+    samples = pygame.sndarray.array(pygame.mixer.Sound(audio_path))
+    resampled = resample(samples, rate)
+
+    os.makedirs(RATE_CACHE_PATH, exist_ok=True)
+    # Written under a temporary name so a half-written file is never picked up
+    temp_file = f"{cache_file}.{threading.get_ident()}.tmp"
+    frequency, _, channels = pygame.mixer.get_init()
+    with wave.open(temp_file, "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(frequency)
+        f.writeframes(resampled.astype("<i2").tobytes())
+    os.replace(temp_file, cache_file)
+    return cache_file
+
+
+def resample(samples, rate):
+    """ Linearly interpolates samples (frames first) so they play rate times faster. """
+    frame_count = len(samples)
+    output = np.empty((int(frame_count / rate),) + samples.shape[1:], dtype=samples.dtype)
+    for start in range(0, len(output), RESAMPLE_CHUNK):
+        positions = np.arange(start, min(start + RESAMPLE_CHUNK, len(output))) * rate
+        left = positions.astype(np.int64)
+        right = np.minimum(left + 1, frame_count - 1)
+        weight = (positions - left).reshape((-1,) + (1,) * (samples.ndim - 1))
+        output[start:start + len(positions)] = np.rint(samples[left] * (1.0 - weight) + samples[right] * weight)
+    return output
+
+
+class RateAudioRenderer:
+    """
+    Renders rate-changed audio on a daemon worker thread so changing the rate on the
+    song select screen never blocks. Only the latest request is kept: while the player
+    is still changing songs or rates, renders they have moved past are skipped.
+    """
+
+    def __init__(self):
+        self.pending = None  # (audio_path, rate)
+        self.condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def request(self, audio_path, rate):
+        if not audio_path or not os.path.exists(audio_path) or is_rendered(audio_path, rate):
+            return
+        with self.condition:
+            self.pending = (audio_path, rate)
+            self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                audio_path, rate = self.pending
+                self.pending = None
+            try:
+                render_rate_audio(audio_path, rate)
+            except (OSError, ValueError, pygame.error) as e:
+                print(f"Warning: Could not render '{audio_path}' at {rate}x: {e}")
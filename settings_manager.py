@@ -1,10 +1,47 @@
 import pygame
 import json
 import os
+from settings import FPS, SCREEN_SIZE
 
 SETTINGS_FILE = "settings.json"
 DEFAULT_SETTINGS = {
     "master_volume": 0.5,
+    # --- Audio ---
+    # Mixer buffer in samples; smaller means less delay before hitsounds are heard, but can
+    # crackle on slow machines (256 at 44100 Hz is about 5.8 ms). Applied on restart.
+    "audio_frequency": 44100,
+    "audio_buffer": 256,
+    "hitsounds": True,
+    "hitsound_volume": 0.8,
+    # Milliseconds notes are judged and drawn later than the chart says, to make up for
+    # audio and input latency. Measured by the calibration screen (C on the main menu).
+    "audio_offset_ms": 0,
+    # --- Main loop ---
+    # "variable": one update per rendered frame. "fixed": updates run at simulation_rate,
+    # rendering is paced separately at render_rate (0 = uncapped) or by vsync.
+    "loop_mode": "variable",
+    "simulation_rate": 1000,
+    "render_rate": FPS,
+    "vsync": False,
+    "show_frame_rates": False,
+    # Frame rate used while nothing on screen is changing (menus left alone).
+    # 0 blocks until input arrives.
+    "idle_frame_rate": 10,
+    # --- Rendering ---
+    # "software": surface blits. "texture": pygame._sdl2 renderer with static assets as
+    # textures (GPU if available). "texture_software": the same on SDL's software renderer.
+    "render_backend": "software",
+    # Fraction of the output resolution the game renders at before upscaling (0.25 - 1.0).
+    "render_scale": 1.0,
+    # Draw text at the output resolution instead of upscaling it with the frame.
+    "native_text": False,
+    # Bilinear instead of nearest-neighbour upscaling (sharper edges cost more).
+    "smooth_upscale": False,
+    # Print a warning for every blit whose source is in a slow pixel format.
+    "debug_blit_formats": False,
+    # Print the delay between the countdown ending and the song starting to play, and the
+    # hitsound latency when a song ends.
+    "log_audio_latency": False,
     "keybinds": {
         "0": "d",
         "1": "f",
@@ -57,10 +94,28 @@ def set_volume(level):
 
 def apply_volume():
     """ Sets the Pygame mixer volume from the current settings. """
+    if not pygame.mixer.get_init():
+        return  # Applied again once the mixer is open
     volume = SETTINGS.get("master_volume", 0.5)
     pygame.mixer.music.set_volume(volume)
 
 
+def get_render_scale():
+    """ Returns the render scale from settings, clamped to a usable range. """
+    return max(0.25, min(1.0, float(SETTINGS.get("render_scale", 1.0))))
+
+
+def get_render_size():
+    """ Returns the internal framebuffer size for the current render scale. """
+    scale = get_render_scale()
+    return max(1, round(SCREEN_SIZE[0] * scale)), max(1, round(SCREEN_SIZE[1] * scale))
+
+
+def scaled(length):
+    """ Converts a length in design pixels (1920x1080 layouts) to render pixels. """
+    return int(round(length * get_render_scale()))
+
+
 def get_keybinds():
     """ Returns the current keybinds dictionary. """
     return SETTINGS.get("keybinds", DEFAULT_SETTINGS["keybinds"])
@@ -0,0 +1,48 @@
+import json
+import os
+
+LIBRARY_FILE = "song_library.json"
+
+# Per-song data the player has set, keyed by beatmap path: {"offset_ms": 10}
+LIBRARY = {}
+
+
+def load_library():
+    """ Loads song_library.json if it exists. """
+    global LIBRARY
+    if os.path.exists(LIBRARY_FILE):
+        try:
+            with open(LIBRARY_FILE, 'r') as f:
+                LIBRARY = json.load(f)
+        except (json.JSONDecodeError, TypeError):
+            LIBRARY = {}
+    else:
+        LIBRARY = {}
+
+
+def save_library():
+    """ Saves the library to song_library.json. """
+    try:
+        with open(LIBRARY_FILE, 'w') as f:
+            json.dump(LIBRARY, f, indent=4)
+    except IOError as e:
+        print(f"Error: Could not save the song library to '{LIBRARY_FILE}': {e}")
+
+
+def get_song_key(beatmap_path):
+    return os.path.normpath(beatmap_path).replace(os.sep, "/")
+
+
+def get_song_offset(beatmap_path):
+    """ Returns the song's own offset in milliseconds, added to the global audio offset. """
+    if not beatmap_path:
+        return 0
+    return LIBRARY.get(get_song_key(beatmap_path), {}).get("offset_ms", 0)
+
+
+def set_song_offset(beatmap_path, offset_ms):
+    """ Stores the song's offset and saves the library. """
+    if not beatmap_path:
+        return
+    LIBRARY.setdefault(get_song_key(beatmap_path), {})["offset_ms"] = offset_ms
+    save_library()
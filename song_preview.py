@@ -0,0 +1,195 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pygame
+from audio_track import reserve_channels
+
+PREVIEW_LENGTH = 10.0  # Seconds of audio in a preview clip, looped while the song stays selected
+PREVIEW_EDGE_FADE = 0.05, 1.0  # Fade in / fade out baked into each clip, in seconds
+PREVIEW_DEBOUNCE = 0.25  # The selection must settle this long before a preview starts
+PREVIEW_FADE_MS = 400  # Crossfade between previews
+PREVIEW_CACHE_PATH = os.path.join("cache", "previews")
+PREVIEW_MEMORY_LIMIT = 12  # Clips kept decoded in memory
+
+
+class PreviewCache:
+    """
+    Preview clips (PREVIEW_LENGTH seconds from a song's preview time) extracted on a
+    daemon worker thread. Clips are kept in memory (least recently used dropped first)
+    and as raw mixer samples on disk, so a song is only decoded once.
+
+    Requests are served newest first, so while scrolling the song the player lands on
+    is extracted next and stale requests wait behind it.
+    """
+
+    def __init__(self):
+        self.clips = OrderedDict()  # key -> Sound
+        self.failed = set()
+        self.requests = []  # Stack of (key, audio_path, start_ms)
+        self.condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def get_key(audio_path, start_ms):
+        return audio_path, start_ms
+
+    def get(self, audio_path, start_ms):
+        """ Returns the clip if it is ready, else None. Never touches the disk. """
+        key = self.get_key(audio_path, start_ms)
+        with self.condition:
+            sound = self.clips.get(key)
+            if sound:
+                self.clips.move_to_end(key)
+            return sound
+
+    def has_failed(self, audio_path, start_ms):
+        return self.get_key(audio_path, start_ms) in self.failed
+
+    def request(self, audio_path, start_ms):
+        """ Queues a clip for extraction (or moves it to the front of the queue). """
+        key = self.get_key(audio_path, start_ms)
+        with self.condition:
+            if key in self.clips or key in self.failed:
+                return
+            self.requests = [request for request in self.requests if request[0] != key]
+            self.requests.append((key, audio_path, start_ms))
+            self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.requests:
+                    self.condition.wait()
+                key, audio_path, start_ms = self.requests.pop()
+
+            try:
+                sound = self.load_clip(audio_path, start_ms)
+            except (OSError, ValueError, pygame.error) as e:
+                print(f"Warning: Could not create a preview for '{audio_path}': {e}")
+                sound = None
+
+            with self.condition:
+                if sound is None:
+                    self.failed.add(key)
+                    continue
+                self.clips[key] = sound
+                while len(self.clips) > PREVIEW_MEMORY_LIMIT:
+                    self.clips.popitem(last=False)
+
+    def load_clip(self, audio_path, start_ms):
+        """ Returns the clip from the disk cache, extracting and saving it first if needed. """
+        cache_file = self.get_cache_file(audio_path, start_ms)
+        if os.path.exists(cache_file):
+            with open(cache_file, "rb") as f:
+                return pygame.mixer.Sound(buffer=f.read())
+
+        sound = extract_clip(audio_path, start_ms)
+        try:
+            os.makedirs(PREVIEW_CACHE_PATH, exist_ok=True)
+            with open(cache_file, "wb") as f:
+                f.write(sound.get_raw())
+        except OSError as e:
+            print(f"Warning: Could not write the preview cache '{cache_file}': {e}")
+        return sound
+
+    @staticmethod
+    def get_cache_file(audio_path, start_ms):
+        """ Cached clips are raw samples, so the name covers the source file and the mixer format. """
+        source = f"{os.path.abspath(audio_path)}|{os.path.getmtime(audio_path)}|{start_ms}|{PREVIEW_LENGTH}|{pygame.mixer.get_init()}"
+        return os.path.join(PREVIEW_CACHE_PATH, hashlib.sha1(source.encode("utf-8")).hexdigest() + ".pcm")
+
+
+def extract_clip(audio_path, start_ms):
+    """ Decodes a song and cuts PREVIEW_LENGTH seconds from start_ms, with short fades at the edges. """
+    samples = pygame.sndarray.array(pygame.mixer.Sound(audio_path))
+    frequency = pygame.mixer.get_init()[0]
+    start = int(start_ms / 1000.0 * frequency)
+    if start >= len(samples):
+        start = 0  # A preview time past the end plays from the beginning instead
+    clip = samples[start:start + int(PREVIEW_LENGTH * frequency)].astype(np.float32)
+
+    fade_in, fade_out = (min(len(clip) // 2, int(seconds * frequency)) for seconds in PREVIEW_EDGE_FADE)
+    shape = (-1,) + (1,) * (clip.ndim - 1)  # Broadcast the ramps over the channels
+    if fade_in:
+        clip[:fade_in] *= np.linspace(0.0, 1.0, fade_in).reshape(shape)
+    if fade_out:
+        clip[-fade_out:] *= np.linspace(1.0, 0.0, fade_out).reshape(shape)
+    return pygame.sndarray.make_sound(np.ascontiguousarray(clip.astype(samples.dtype)))
+
+
+class PreviewPlayer:
+    """
+    Plays song previews on two reserved mixer channels, crossfading between them.
+    select() only records the song; once the selection has settled for PREVIEW_DEBOUNCE
+    the clip is requested from the cache and faded in as soon as the worker has it,
+    so scrolling through songs does no audio work on the main thread.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache or PreviewCache()
+        self.channels = reserve_channels(2)
+        self.active_channel = 0
+        self.volume = None
+
+        self.pending = None  # (audio_path, start_ms) waiting to play
+        self.prefetch = []
+        self.selected_at = 0.0
+        self.requested = False
+
+    def select(self, audio_path, start_ms, prefetch=()):
+        """ Plays this song's preview once the selection settles. prefetch lists clips to extract too. """
+        self.pending = (audio_path, start_ms)
+        self.prefetch = list(prefetch)
+        self.selected_at = time.time()
+        self.requested = False
+
+    def is_waiting(self):
+        return self.pending is not None
+
+    def update(self):
+        self.sync_volume()
+        if not self.pending or time.time() < self.selected_at + PREVIEW_DEBOUNCE:
+            return
+
+        audio_path, start_ms = self.pending
+        if not self.requested:
+            if not os.path.exists(audio_path):
+                self.fadeout()
+                return
+            # The selected song is requested last so the worker extracts it first
+            for neighbour in self.prefetch:
+                if os.path.exists(neighbour[0]):
+                    self.cache.request(*neighbour)
+            self.cache.request(audio_path, start_ms)
+            self.requested = True
+
+        sound = self.cache.get(audio_path, start_ms)
+        if sound:
+            self.crossfade_to(sound)
+            self.pending = None
+        elif self.cache.has_failed(audio_path, start_ms):
+            self.fadeout()
+
+    def crossfade_to(self, sound):
+        if pygame.mixer.music.get_busy():
+            pygame.mixer.music.fadeout(PREVIEW_FADE_MS)  # Menu music hands over to the preview
+        self.channels[self.active_channel].fadeout(PREVIEW_FADE_MS)
+        self.active_channel = 1 - self.active_channel
+        self.channels[self.active_channel].play(sound, loops=-1, fade_ms=PREVIEW_FADE_MS)
+
+    def fadeout(self, ms=PREVIEW_FADE_MS):
+        """ Fades out whatever preview is playing and drops any pending one. """
+        self.pending = None
+        for channel in self.channels:
+            channel.fadeout(ms)
+
+    def sync_volume(self):
+        volume = pygame.mixer.music.get_volume()  # Follows the master volume setting
+        if volume != self.volume:
+            self.volume = volume
+            for channel in self.channels:
+                channel.set_volume(volume)
@@ -3,20 +3,46 @@ from states.song_select_state import SongSelectState
 from states.loading_state import LoadingState
 from states.results_state import ResultsState
 from states.gameplay_state import GameplayState
+from states.calibration_state import CalibrationState
+
+STATE_CLASSES = {
+    "MAIN_MENU": MainMenuState,
+    "SONG_SELECT": SongSelectState,
+    "LOADING": LoadingState,
+    "GAMEPLAY": GameplayState,
+    "RESULTS": ResultsState,
+    "CALIBRATION": CalibrationState,
+}
+
 
 class StateManager:
+    """
+    Runs the active state and switches between them. States are only constructed
+    when first needed, so the first frame doesn't wait on them; prewarm() queues
+    states to be built ahead of time instead. The main loop calls build_prewarmed_state()
+    while it waits idle, so they are only built while nothing is moving on screen.
+    """
+
     def __init__(self):
-        self.states = {
-            "MAIN_MENU": MainMenuState(self),
-            "SONG_SELECT": SongSelectState(self),
-            "LOADING": LoadingState(self),
-            "GAMEPLAY": GameplayState(self),
-            "RESULTS": ResultsState(self),
-        }
+        self.states = {}  # Constructed states, by name
+        self.prewarm_queue = []
         self.state_name = "MAIN_MENU"
-        self.state = self.states[self.state_name]
+        self.state = self.get_state(self.state_name)
         self.state.startup({})
 
+    def get_state(self, name):
+        """ Returns the named state, constructing it now if it hasn't been yet. """
+        state = self.states.get(name)
+        if state is None:
+            state = self.states[name] = STATE_CLASSES[name](self)
+        return state
+
+    def prewarm(self, *names):
+        """ Queues states to be constructed while the screen is idle, before they are entered. """
+        for name in names:
+            if name not in self.states and name not in self.prewarm_queue:
+                self.prewarm_queue.append(name)
+
     def get_event(self, event):
         self.state.get_event(event)
 
@@ -25,14 +51,28 @@ class StateManager:
             self.flip_state()
         self.state.update(dt)
 
-    def draw(self, surface):
-        self.state.draw(surface)
+    def build_prewarmed_state(self):
+        """ Builds the next queued state if the active one is idle. Returns True if it built one. """
+        if self.prewarm_queue and not self.state.done and not self.state.is_animating():
+            self.get_state(self.prewarm_queue.pop(0))
+            return True
+        return False
+
+    def is_animating(self):
+        """ True while the active state is changing on screen or about to switch states. """
+        return self.state.done or self.state.is_animating()
+
+    def draw(self, compositor, lag_ms=0.0):
+        self.state.render_lag = lag_ms
+        self.state.draw(compositor)
 
     def flip_state(self):
         previous_state_persist = self.state.persist
         self.state.done = False
         self.state_name = self.state.next_state
-        self.state = self.states[self.state_name]
+        if self.state_name in self.prewarm_queue:
+            self.prewarm_queue.remove(self.state_name)
+        self.state = self.get_state(self.state_name)
         self.state.startup(previous_state_persist)
 
     def is_done(self):
@@ -40,4 +80,3 @@ class StateManager:
         Checks if the current state has signaled to quit the entire game.
         """
         return self.state.quit
-
@@ -1,4 +1,6 @@
 import pygame
+import settings_manager
+import asset_loader
 
 
 class BaseState:
@@ -12,9 +14,10 @@ class BaseState:
         self.done = False
         self.quit = False
         self.next_state = None
-        self.screen_rect = pygame.display.get_surface().get_rect()
+        # The render resolution, which is smaller than the window when render_scale < 1
+        self.screen_rect = pygame.Rect((0, 0), settings_manager.get_render_size())
         self.persist = {}  # Data that persists between states
-        self.font = pygame.font.Font(None, 48)
+        self.font = asset_loader.load_font(None, 48)
 
         # --- Transition Attributes ---
         self.transition_time = 0.5  # 0.5 seconds for fade in/out
@@ -22,6 +25,13 @@ class BaseState:
         self.transition_state = "in"  # "in", "static", "out"
         self.transition_alpha = 0
 
+        # --- Post-processing (full-screen effects applied after the scene is drawn) ---
+        self.post_effects = []
+
+        # Simulation time (ms) not yet stepped when a frame is drawn in fixed-timestep mode.
+        # States can use it to interpolate moving objects between updates.
+        self.render_lag = 0.0
+
     def startup(self, persistent):
         """Called when a state resumes being active."""
         self.persist = persistent
@@ -39,6 +49,13 @@ class BaseState:
             self.transition_state = "out"
             self.transition_timer = self.transition_time
 
+    def is_animating(self):
+        """
+        Returns True while anything on screen is changing. When it returns False the
+        game drops to the idle frame rate until input arrives.
+        """
+        return self.transition_state != "static"
+
     def get_transition_alpha(self):
         """Calculates the current alpha for UI elements during transitions."""
         return self.transition_alpha
@@ -66,6 +83,12 @@ class BaseState:
         elif self.transition_state == "static":
             self.transition_alpha = 255
 
-    def draw(self, surface):
-        """Draw everything to the screen."""
+    def apply_post_effects(self, surface):
+        """Runs every enabled post-processing effect over the drawn scene, in order."""
+        for effect in self.post_effects:
+            if effect.enabled:
+                effect.apply(surface)
+
+    def draw(self, compositor):
+        """Draw everything into the compositor's layers."""
         pass
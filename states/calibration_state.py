@@ -0,0 +1,138 @@
+import time
+import pygame
+from settings import *
+from states.base_state import BaseState
+from audio_track import reserve_channels
+from gameplay.calibration import summarize_offsets, create_metronome
+from utils import draw_text, mark_drawn
+import asset_loader
+import settings_manager
+from settings_manager import scaled
+
+CALIBRATION_BPM = 100
+COUNT_IN_BEATS = 4  # Clicks before taps start counting
+CALIBRATION_BEATS = 32  # Clicks to tap along to
+
+
+class CalibrationState(BaseState):
+    """
+    Plays a metronome and collects how early or late the player taps to it. The median
+    error becomes the global audio offset, which shifts judging and note drawing so
+    they line up with what this player hears and does on this hardware.
+
+    Space or any lane key taps, Enter saves the result, R retries and Escape leaves.
+    """
+
+    def __init__(self, state_manager):
+        super(CalibrationState, self).__init__(state_manager)
+        self.next_state = "MAIN_MENU"
+        self.font_title = asset_loader.load_font("Inter", 48, bold=True)
+        self.font_info = asset_loader.load_font("Inter", 28)
+        self.beat_length = 60.0 / CALIBRATION_BPM
+        self.channel = reserve_channels(1)[0] if pygame.mixer.get_init() else None
+        self.metronome = None  # Rendered on first use, at the mixer's frequency
+        self.reset()
+
+    def reset(self):
+        self.phase = "READY"  # "READY", "RUNNING", "DONE"
+        self.start_time = 0.0
+        self.errors = []
+        self.stats = None
+
+    def startup(self, persistent):
+        super().startup(persistent)
+        pygame.mixer.music.fadeout(300)
+        self.persist['menu_music_active'] = False
+        self.tap_keys = self.get_tap_keys()
+        self.reset()
+
+    @staticmethod
+    def get_tap_keys():
+        keys = {pygame.K_SPACE}
+        for key_name in settings_manager.get_keybinds().values():
+            try:
+                keys.add(pygame.key.key_code(key_name))
+            except ValueError:
+                pass  # GameContext warns about invalid keybinds
+        return keys
+
+    def start(self):
+        if self.channel:
+            if self.metronome is None:
+                self.metronome = create_metronome(CALIBRATION_BPM, COUNT_IN_BEATS + CALIBRATION_BEATS)
+            self.metronome.set_volume(settings_manager.SETTINGS.get("master_volume", 0.5))
+            self.channel.play(self.metronome)
+        self.reset()
+        self.phase = "RUNNING"
+        self.start_time = time.perf_counter()
+
+    def get_elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    def get_event(self, event):
+        super().get_event(event)
+        if self.transition_state != "static" or event.type != pygame.KEYDOWN:
+            return
+
+        if event.key == pygame.K_ESCAPE:
+            if self.channel:
+                self.channel.stop()
+            self.go_to_next_state()
+        elif self.phase == "RUNNING" and event.key in self.tap_keys:
+            self.record_tap(self.get_elapsed())
+        elif self.phase != "RUNNING" and (event.key in self.tap_keys or event.key == pygame.K_r):
+            self.start()
+        elif self.phase == "DONE" and event.key == pygame.K_RETURN and self.stats:
+            settings_manager.SETTINGS["audio_offset_ms"] = round(self.stats["median"])
+            settings_manager.save_settings()
+            self.go_to_next_state()
+
+    def record_tap(self, elapsed):
+        """ Stores the tap's error against the nearest click, ignoring the count-in and wild taps. """
+        beat = round(elapsed / self.beat_length)
+        error = elapsed - beat * self.beat_length
+        if COUNT_IN_BEATS <= beat < COUNT_IN_BEATS + CALIBRATION_BEATS and abs(error) < self.beat_length / 2:
+            self.errors.append(error * 1000.0)
+
+    def update(self, dt):
+        super().update(dt)
+        if self.phase == "RUNNING" and self.get_elapsed() >= (COUNT_IN_BEATS + CALIBRATION_BEATS + 1) * self.beat_length:
+            self.phase = "DONE"
+            self.stats = summarize_offsets(self.errors)
+
+    def is_animating(self):
+        return super().is_animating() or self.phase == "RUNNING"
+
+    def draw(self, compositor):
+        surface = compositor.begin_layer("background")
+        surface.fill(BLACK)
+        ui_surface = compositor.begin_layer("state_ui", alpha=self.get_transition_alpha())
+        center_x, center_y = self.screen_rect.center
+        line = scaled(50)
+
+        draw_text(ui_surface, "OFFSET CALIBRATION", (center_x, center_y - 4 * line), self.font_title, WHITE)
+        current = settings_manager.SETTINGS.get("audio_offset_ms", 0)
+
+        if self.phase == "READY":
+            lines = ["Tap along to the clicks with Space or your lane keys.",
+                     f"The first {COUNT_IN_BEATS} clicks are a count-in.",
+                     f"Current offset: {current:+d} ms", "Press Space to start, Escape to go back."]
+        elif self.phase == "RUNNING":
+            beat = int(self.get_elapsed() / self.beat_length)
+            # A pulse on every click, brighter on the first of the bar
+            pulse = max(0.0, 1.0 - (self.get_elapsed() % self.beat_length) / self.beat_length * 3)
+            radius = scaled(40) + int(scaled(20) * pulse)
+            color = (255, 230, 80) if beat % 4 == 0 else WHITE
+            mark_drawn(ui_surface, pygame.draw.circle(ui_surface, color, (center_x, center_y - line), radius, scaled(4)))
+            counting = "Count-in..." if beat < COUNT_IN_BEATS else f"Taps: {len(self.errors)} / {CALIBRATION_BEATS}"
+            lines = ["", counting, f"Last tap: {self.errors[-1]:+.1f} ms" if self.errors else ""]
+        elif self.stats:
+            lines = [f"Median: {self.stats['median']:+.1f} ms    Trimmed mean: {self.stats['trimmed_mean']:+.1f} ms",
+                     f"Spread: {self.stats['std_dev']:.1f} ms (variance {self.stats['variance']:.1f}) over {self.stats['count']} taps",
+                     f"New offset: {round(self.stats['median']):+d} ms (was {current:+d} ms)",
+                     "Enter to save, R to retry, Escape to cancel."]
+        else:
+            lines = ["No taps were recorded.", "Press R to retry or Escape to go back."]
+
+        for i, text in enumerate(lines):
+            draw_text(ui_surface, text, (center_x, center_y + (i + 1) * line), self.font_info, WHITE)
@@ -1,6 +1,7 @@
 import pygame
 import os
 import math
+from bisect import bisect_right
 from settings import *
 from states.base_state import BaseState
 from gameplay.context import GameContext
@@ -10,7 +11,20 @@ from gameplay.mechanics_manager import MechanicManager
 from gameplay.hud_manager import HUDManager
 from ui.ui_manager import UIManager
 from ui.button import Button
+from utils import blit_static
+from audio_track import AudioTrack
+from hitsounds import HitsoundEngine
 import asset_loader
+import settings_manager
+import song_library
+from settings_manager import scaled
+
+# --- Practice mode ---
+PRACTICE_SEEK_SECONDS = 5.0  # Shift + arrow keys
+PRACTICE_BAR_GRACE = 0.25  # Seeking back within this long of a bar start goes to the bar before
+
+QUICK_RETRY_KEY = pygame.K_BACKQUOTE
+SONG_OFFSET_STEP_MS = 5  # - and = nudge the song's own offset by this much
 
 
 class GameplayState(BaseState):
@@ -23,16 +37,19 @@ class GameplayState(BaseState):
         self.pause_ui.load_layout("layouts/pause_menu.json")
         self.setup_pause_buttons()
 
-        self.gameplay_surface = pygame.Surface(SCREEN_SIZE)
+        self.gameplay_surface = pygame.Surface(self.screen_rect.size)
         self.zoom_level = 1.0
         self.target_zoom = 1.0
 
         # --- New Countdown/Delay Logic ---
         self.game_phase = "COUNTDOWN"
         self.countdown_duration = 3.0
+        self.retry_countdown_duration = 1.0  # Shorter lead-in when retrying in place
         self.countdown_timer = self.countdown_duration
         self.font_countdown = asset_loader.load_font("Poppins", 84, bold=True)
         self.song_data = {}
+        self.track = None  # The song's AudioTrack, prepared by the loading screen
+        self.hitsounds = HitsoundEngine()  # Samples are decoded once, here
 
     def startup(self, persistent):
         super().startup(persistent)
@@ -51,19 +68,43 @@ class GameplayState(BaseState):
             return
 
         self.next_state = "RESULTS"
+        self.track = self.get_audio_track()
         self.context = GameContext(chart, self.screen_rect)
+        self.context.practice_mode = self.persist.get("practice_mode", False)
+        self.hitsounds.apply_settings()
+        self.context.hitsounds = self.hitsounds
+        self.song_offset_ms = song_library.get_song_offset(self.song_data.get("beatmap_path"))
+        self.context.audio_offset += self.song_offset_ms / 1000.0
         self.lane_manager = LaneManager(self.context)
         self.note_manager = NoteManager(self.context)
         self.mechanic_manager = MechanicManager(self.context)
         self.hud_manager = HUDManager(self.context)
 
+        # The loading screen has usually built the blurred background already
         original_img = asset_loader.load_image(self.song_data.get("image_path"))
-        if original_img:
+        if self.persist.get("gameplay_background"):
+            self.background_img = self.persist["gameplay_background"]
+        elif original_img:
             self.background_img = asset_loader.create_blurred_background(original_img, self.screen_rect.size)
         else:
             self.background_img = pygame.Surface(self.screen_rect.size);
             self.background_img.fill(BLACK)
 
+    def get_audio_track(self):
+        """
+        Returns the track the loading screen opened and primed. If it is missing (or for
+        another song) the track is prepared here, so the countdown end never touches the disk.
+        """
+        audio_path = self.song_data.get("audio_path")
+        rate = self.persist["chart"].rate
+        track = self.persist.get("audio_track")
+        if track and track.is_loaded and track.path == audio_path and track.rate == rate:
+            return track
+        track = AudioTrack(audio_path, rate)
+        if audio_path and os.path.exists(audio_path):
+            track.prepare()
+        return track
+
     def setup_pause_buttons(self):
         continue_btn = self.pause_ui.get_element_by_name("continue_button")
         if continue_btn: continue_btn.on_click = self.toggle_pause
@@ -81,17 +122,27 @@ class GameplayState(BaseState):
         self.is_paused = not self.is_paused
         if self.is_paused:
             self.target_zoom = 0.8
-            pygame.mixer.music.pause()
+            self.track.pause()
         else:
             self.target_zoom = 1.0
-            pygame.mixer.music.unpause()
+            self.track.unpause()
 
     def restart_song(self):
-        self.next_state = "LOADING"
-        self.go_to_next_state()
+        """
+        Retries the chart in place. The parsed chart, the loaded music and the blurred
+        background are kept; only the context and note state are reset.
+        """
+        self.track.stop()
+        self.track.prime()
+        self.context.reset()
+        self.note_manager.reset()
+        self.is_paused = False
+        self.target_zoom = 1.0
+        self.game_phase = "COUNTDOWN"
+        self.countdown_timer = self.retry_countdown_duration
 
     def quit_to_menu(self):
-        pygame.mixer.music.stop()
+        self.track.stop()
         self.next_state = "SONG_SELECT"
         self.go_to_next_state()
 
@@ -104,8 +155,24 @@ class GameplayState(BaseState):
 
         if self.is_paused:
             self.pause_ui.get_event(event)
+            return
+
+        if (event.type == pygame.KEYDOWN and event.key == QUICK_RETRY_KEY and self.transition_state == "static"
+                and self.game_phase in ("COUNTDOWN", "PLAYING")):
+            self.restart_song()
+            return
+
+        if (event.type == pygame.KEYDOWN and event.key in (pygame.K_MINUS, pygame.K_EQUALS)
+                and self.game_phase in ("COUNTDOWN", "PLAYING") and event.key not in self.context.key_map.values()):
+            self.adjust_song_offset(SONG_OFFSET_STEP_MS if event.key == pygame.K_EQUALS else -SONG_OFFSET_STEP_MS)
+            return
+
+        if (self.context.practice_mode and event.type == pygame.KEYDOWN and self.transition_state == "static"
+                and self.game_phase in ("COUNTDOWN", "PLAYING") and event.key not in self.context.key_map.values()):
+            self.handle_practice_key(event.key)
+
         # Only process gameplay input if the game is actually playing
-        elif self.game_phase == "PLAYING" and self.transition_state == "static":
+        if self.game_phase == "PLAYING" and self.transition_state == "static":
             self.note_manager.get_event(event)
             self.mechanic_manager.get_event(event)
 
@@ -121,6 +188,7 @@ class GameplayState(BaseState):
 
         if self.transition_state != "static":
             return  # Don't update gameplay logic during screen transitions
+        self.hud_manager.update(dt)
 
         # --- Game Phase Logic ---
         if self.game_phase == "COUNTDOWN":
@@ -128,26 +196,100 @@ class GameplayState(BaseState):
             if self.countdown_timer <= 0:
                 self.game_phase = "PLAYING"
                 # --- Start the music and gameplay now ---
-                audio_path = self.song_data.get("audio_path")
-                if audio_path and os.path.exists(audio_path):
-                    pygame.mixer.music.load(audio_path)
-                    pygame.mixer.music.play(start=self.context.start_time_offset)
+                self.track.play(self.context.start_time_offset)
 
         elif self.game_phase == "PLAYING":
             self.context.update_time(dt / 1000.0)
+            if self.track.update() and settings_manager.SETTINGS.get("log_audio_latency", False):
+                print(f"Audio start delay: {self.track.start_delay_ms:.1f} ms")
+
+            loop = self.get_practice_loop()
+            if loop and self.context.song_time >= loop[1]:
+                self.seek(loop[0])
             self.lane_manager.update(dt)
             self.note_manager.update(dt)
             self.mechanic_manager.update(dt)
 
-            if not self.note_manager.notes_to_spawn and not self.note_manager.active_notes:
+            if self.note_manager.is_finished():
                 self.game_phase = "FINISHED"
                 self.persist["results_data"] = self.context.get_results()
                 self.persist["selected_song_data"] = self.song_data
                 pygame.mixer.music.fadeout(1000)
+                if settings_manager.SETTINGS.get("log_audio_latency", False):
+                    self.log_hitsound_latency()
                 self.go_to_next_state()
 
+    def adjust_song_offset(self, step_ms):
+        """ Nudges this song's offset (on top of the global one), applies it at once and saves it. """
+        self.song_offset_ms += step_ms
+        self.context.audio_offset += step_ms / 1000.0
+        song_library.set_song_offset(self.song_data.get("beatmap_path"), self.song_offset_ms)
+        self.hud_manager.show_message(f"Song offset: {self.song_offset_ms:+d} ms")
+
+    def log_hitsound_latency(self):
+        report = self.hitsounds.get_latency_report()
+        print(f"Hitsounds: {report['buffer']} sample buffer at {report['frequency']} Hz ({report['buffer_ms']:.1f} ms), "
+              f"trigger {report['trigger_ms']:.3f} ms over {report['hits']} hits, "
+              f"key to sound about {report['key_to_sound_ms']:.1f} ms")
+
+    # --- Practice mode ---
+    def handle_practice_key(self, key):
+        """
+        Left/Right seek by bar (by PRACTICE_SEEK_SECONDS with Shift), [ and ] set the loop
+        start and end at the current time, Backspace clears the loop and R rewinds to its start.
+        """
+        song_time = self.context.song_time
+        shift = pygame.key.get_mods() & pygame.KMOD_SHIFT
+        loop_start, loop_end = self.context.loop_range or (None, None)
+
+        if key == pygame.K_LEFT:
+            self.seek(song_time - PRACTICE_SEEK_SECONDS if shift else self.get_bar_time(song_time, -1))
+        elif key == pygame.K_RIGHT:
+            self.seek(song_time + PRACTICE_SEEK_SECONDS if shift else self.get_bar_time(song_time, 1))
+        elif key == pygame.K_LEFTBRACKET:
+            self.context.loop_range = (song_time, loop_end if loop_end is not None and loop_end > song_time else None)
+        elif key == pygame.K_RIGHTBRACKET:
+            if loop_start is not None and song_time > loop_start:
+                self.context.loop_range = (loop_start, song_time)
+        elif key == pygame.K_BACKSPACE:
+            self.context.loop_range = None
+        elif key == pygame.K_r:
+            self.seek(loop_start if loop_start is not None else 0.0)
+
+    def get_practice_loop(self):
+        """ Returns the (start, end) of the practice loop once both ends are set, else None. """
+        loop = self.context.loop_range
+        if loop and loop[0] is not None and loop[1] is not None:
+            return loop
+        return None
+
+    def get_bar_time(self, song_time, step):
+        """ Returns the start of the current bar (step -1) or of the next one (step 1). """
+        bars = self.context.beat_grid.bar_times
+        if not bars:
+            return song_time + step * PRACTICE_SEEK_SECONDS
+        if step < 0:
+            index = bisect_right(bars, song_time - PRACTICE_BAR_GRACE) - 1
+            return bars[index] if index >= 0 else 0.0
+        index = bisect_right(bars, song_time)
+        return bars[index] if index < len(bars) else song_time
+
+    def seek(self, song_time):
+        """
+        Jumps the chart and the music to song_time. The note manager rebuilds its
+        spawn and active sets with a binary search, so this is instant on long charts.
+        """
+        song_time = max(0.0, min(song_time, self.context.get_end_time()))
+        self.context.seek(song_time)
+        self.note_manager.seek(self.context.get_chart_time())
+        if self.game_phase == "PLAYING":
+            self.track.play(song_time)
+
+    def is_animating(self):
+        return True  # Notes, countdown and pause zoom are always moving
+
     def draw_gameplay(self, surface):
-        surface.blit(self.background_img, (0, 0))
+        blit_static(surface, self.background_img, (0, 0))
         self.lane_manager.draw(surface)
 
         if self.game_phase == "PLAYING":
@@ -168,30 +310,35 @@ class GameplayState(BaseState):
 
                 # Draw text with an outline for visibility
                 from utils import draw_text
-                draw_text(surface, text, (self.screen_rect.centerx + 4, self.screen_rect.centery + 4), font,
+                shadow_offset = scaled(4)
+                draw_text(surface, text, (self.screen_rect.centerx + shadow_offset,
+                                          self.screen_rect.centery + shadow_offset), font,
                           (0, 0, 0, 150), text_rect_origin='center')
                 draw_text(surface, text, self.screen_rect.center, font, WHITE, text_rect_origin='center')
 
-    def draw(self, surface):
-        self.draw_gameplay(self.gameplay_surface)
+    def draw(self, compositor):
+        surface = compositor.begin_layer("background")
+
+        # Interpolate note positions between fixed-timestep updates while the song is running
+        is_running = self.game_phase == "PLAYING" and not self.is_paused and self.transition_state == "static"
+        self.context.render_lag = self.render_lag / 1000.0 if is_running else 0.0
 
         if abs(self.zoom_level - 1.0) < 0.001:
-            surface.blit(self.gameplay_surface, (0, 0))
+            # Unzoomed, the scene is drawn straight into the frame without an intermediate copy
+            self.draw_gameplay(surface)
         else:
-            scaled_size = (int(SCREEN_WIDTH * self.zoom_level), int(SCREEN_HEIGHT * self.zoom_level))
+            self.draw_gameplay(self.gameplay_surface)
+            scaled_size = (int(self.screen_rect.width * self.zoom_level), int(self.screen_rect.height * self.zoom_level))
             scaled_surface = pygame.transform.smoothscale(self.gameplay_surface, scaled_size)
 
             surface.fill(BLACK)
 
-            pos_x = (SCREEN_WIDTH - scaled_size[0]) / 2
-            pos_y = (SCREEN_HEIGHT - scaled_size[1]) / 2
+            pos_x = (self.screen_rect.width - scaled_size[0]) / 2
+            pos_y = (self.screen_rect.height - scaled_size[1]) / 2
             surface.blit(scaled_surface, (pos_x, pos_y))
 
         if self.is_paused:
-            overlay = pygame.Surface(SCREEN_SIZE, pygame.SRCALPHA)
             overlay_alpha = int(200 * (1 - ((self.zoom_level - 0.8) / 0.2)))
-            overlay.fill((0, 0, 0, max(0, overlay_alpha)))
-            surface.blit(overlay, (0, 0))
-
-            self.pause_ui.draw(surface)
+            overlay = compositor.begin_layer("overlay", dim=max(0, overlay_alpha))
+            self.pause_ui.draw(overlay)
 
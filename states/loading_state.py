@@ -6,7 +6,12 @@ from ui.ui_manager import UIManager
 from ui.image_panel import ImagePanel
 from ui.custom_widgets.Animated_arc_Widget import AnimatedArc
 from gameplay import chart_loader
+from background_tasks import TaskRunner
+from audio_track import AudioTrack
+from rate_audio import is_rendered
+from utils import blit_static
 import asset_loader
+from settings_manager import scaled
 
 class LoadingState(BaseState):
     def __init__(self, state_manager):
@@ -17,10 +22,12 @@ class LoadingState(BaseState):
         self.ui_manager.load_layout("layouts/Loading_Layout.json")
 
         self.song_data = {}
-        
+        self.loader = None
+        self.artwork_shown = False
+
         placeholder = self.ui_manager.get_element_by_name("loading_ellipse")
         if placeholder:
-            self.loading_arc = AnimatedArc(pos=placeholder.absolute_pos, size=placeholder.size, width=10, color=(255,255,255), speed=-360)
+            self.loading_arc = AnimatedArc(pos=placeholder.absolute_pos, size=placeholder.size, width=scaled(10), color=(255,255,255), speed=-360)
         else: self.loading_arc = None
 
     def startup(self, persistent):
@@ -35,42 +42,91 @@ class LoadingState(BaseState):
 
         artwork_panel = self.ui_manager.get_element_by_name("IMG_beatmap_art_placeholder")
         if artwork_panel and isinstance(artwork_panel, ImagePanel):
-            original_img = asset_loader.load_image(self.song_data.get("image_path"))
-            artwork_panel.set_image(original_img)
-            
+            artwork_panel.set_image(None)
+        self.artwork_shown = False
+        if self.loading_arc:
+            self.loading_arc.set_progress(0)
+
+        # --- The heavy work runs on a worker thread so the spinner keeps animating ---
+        self.rate = self.persist.get("rate", 1.0)
+        audio_path = self.song_data.get("audio_path")
+        # Rendering a rate the song select screen hasn't finished yet dominates the load
+        audio_weight = 2 if not audio_path or not os.path.exists(audio_path) or is_rendered(audio_path, self.rate) else 20
+        self.loader = TaskRunner([
+            ("chart", self.load_chart, 1),
+            ("artwork", self.load_artwork, 1),
+            ("background", self.create_background, 3),
+            ("audio", self.prepare_audio, audio_weight),
+        ])
+        self.loader.start()
+
+    # --- Loading tasks (run on the worker thread) ---
+    def load_chart(self, results):
         chart_path = self.song_data.get("beatmap_path")
-        if chart_path:
-            self.persist["chart"] = chart_loader.load_chart(chart_path)
-        else: self.persist["chart"] = None
-        
+        chart = chart_loader.load_chart(chart_path) if chart_path else None
+        if chart and self.rate != 1.0:
+            chart.apply_rate(self.rate)
+        return chart
+
+    def load_artwork(self, results):
+        return asset_loader.load_image(self.song_data.get("image_path"))
+
+    def create_background(self, results):
+        """ The blurred gameplay background, built here so GameplayState doesn't have to. """
+        artwork = results.get("artwork")
+        return asset_loader.create_blurred_background(artwork, self.screen_rect.size) if artwork else None
+
+    def prepare_audio(self, results):
+        """ Renders the song at its rate; finish_loading opens and primes it on the main thread. """
         audio_path = self.song_data.get("audio_path")
+        track = AudioTrack(audio_path, self.rate)
         if audio_path and os.path.exists(audio_path):
-            pygame.mixer.music.load(audio_path)
-            
-        self.loading_timer = 2.0
+            try:
+                track.render()
+            except (OSError, ValueError, pygame.error) as e:
+                print(f"Warning: Could not render audio '{audio_path}': {e}")
+        return track
+
+    def finish_loading(self):
+        self.persist["chart"] = self.loader.results.get("chart")
+        self.persist["gameplay_background"] = self.loader.results.get("background")
+        track = self.loader.results.get("audio")
+        # pygame.mixer.music isn't thread-safe, so the track is loaded and primed here
+        if track and track.play_path:
+            track.prepare()
+        self.persist["audio_track"] = track
 
     def update(self, dt):
         super().update(dt)
-        if self.loading_arc: self.loading_arc.update(dt)
-            
-        self.loading_timer -= dt / 1000.0
-        if self.loading_timer <= 0 and self.transition_state == "static":
+        if self.loading_arc:
+            self.loading_arc.set_progress(self.loader.progress * 100)
+            self.loading_arc.update(dt)
+
+        # Show the artwork as soon as it has been decoded
+        if not self.artwork_shown and self.loader.results.get("artwork"):
+            artwork_panel = self.ui_manager.get_element_by_name("IMG_beatmap_art_placeholder")
+            if artwork_panel and isinstance(artwork_panel, ImagePanel):
+                artwork_panel.set_image(self.loader.results["artwork"])
+            self.artwork_shown = True
+
+        # Move on as soon as everything is loaded
+        if self.loader.is_done and self.transition_state == "static":
+            self.finish_loading()
             self.go_to_next_state()
 
-    def draw(self, surface):
+    def is_animating(self):
+        return True  # The spinner never stops while loading
+
+    def draw(self, compositor):
+        surface = compositor.begin_layer("background")
         surface.fill(BLACK)
         prev_state_bg = self.persist.get("final_background")
         if prev_state_bg:
-            surface.blit(prev_state_bg, (0,0))
+            blit_static(surface, prev_state_bg, (0,0))
 
-        # --- Create a temporary surface for the fade-in effect ---
-        ui_surface = pygame.Surface(self.screen_rect.size, pygame.SRCALPHA)
-            
+        # --- The UI fades in and out with the master alpha from the base state ---
+        ui_surface = compositor.begin_layer("state_ui", alpha=self.get_transition_alpha())
         self.ui_manager.draw(ui_surface)
         if self.loading_arc:
             self.loading_arc.draw(ui_surface)
 
-        # Apply the master alpha from the base state and blit to the main screen
-        ui_surface.set_alpha(self.get_transition_alpha())
-        surface.blit(ui_surface, (0, 0))
-
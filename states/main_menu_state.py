@@ -7,6 +7,7 @@ from settings import *
 from states.base_state import BaseState
 from ui.ui_manager import UIManager
 from utils import draw_text
+from post_processing import GlitchEffect
 import asset_loader
 
 
@@ -24,6 +25,8 @@ class MainMenuState(BaseState):
         self.quit_hold_duration = 1.5  # Longer for a better effect
         self.is_quitting = False
         self.font_quit = asset_loader.load_font("Inter", 30)
+        self.glitch_effect = GlitchEffect()
+        self.post_effects.append(self.glitch_effect)
 
     def startup(self, persistent):
         super().startup(persistent)
@@ -80,6 +83,9 @@ class MainMenuState(BaseState):
         super().get_event(event)
         if not self.is_transitioning_out and self.transition_state == "static" and not self.is_quitting:
             if event.type == pygame.KEYUP or event.type == pygame.MOUSEBUTTONUP:
+                # C opens offset calibration, anything else goes to song select
+                is_calibration = event.type == pygame.KEYUP and event.key == pygame.K_c
+                self.next_state = "CALIBRATION" if is_calibration else "SONG_SELECT"
                 self.trigger_transition_out()
 
     def trigger_transition_out(self):
@@ -110,7 +116,11 @@ class MainMenuState(BaseState):
             self.is_quitting = False
             self.esc_hold_time = 0.0
 
-    def draw(self, surface):
+    def is_animating(self):
+        return super().is_animating() or self.is_quitting or self.ui_manager.is_animating()
+
+    def draw(self, compositor):
+        surface = compositor.begin_layer("background")
         surface.fill(BLACK)
 
         progress = self.esc_hold_time / self.quit_hold_duration
@@ -119,36 +129,12 @@ class MainMenuState(BaseState):
         if not self.is_quitting or progress < 0.3:
             self.ui_manager.draw(surface)
 
-        # --- Draw Hold to Quit Glitch Animation ---
+        # --- Hold to Quit Glitch Animation (slice shifting + chromatic aberration) ---
+        self.glitch_effect.intensity = progress if self.is_quitting else 0.0
+        self.apply_post_effects(surface)
+
         if self.is_quitting:
-            # 1. Horizontal slice shifting effect
-            num_shifts = int(progress * 20)
-            for _ in range(num_shifts):
-                h = random.randint(2, 20)
-                y = random.randint(0, self.screen_rect.height - h)
-                try:
-                    # Grab a slice of the screen to shift
-                    subsurface = surface.subsurface(pygame.Rect(0, y, self.screen_rect.width, h)).copy()
-                    shift_amount = random.randint(-int(progress * 60), int(progress * 60))
-                    surface.blit(subsurface, (shift_amount, y))
-                except ValueError:
-                    continue  # Skip if slice is out of bounds
-
-            # 2. Chromatic aberration effect (color splitting)
-            if progress > 0.2:
-                temp_surface = surface.copy()
-                red_surface = temp_surface.copy();
-                red_surface.fill((255, 0, 0), special_flags=pygame.BLEND_RGB_MULT)
-                cyan_surface = temp_surface.copy();
-                cyan_surface.fill((0, 255, 255), special_flags=pygame.BLEND_RGB_MULT)
-
-                offset = int(progress * 15)
-                surface.blit(red_surface, (random.randint(-offset, offset), random.randint(-offset, offset)),
-                             special_flags=pygame.BLEND_RGB_ADD)
-                surface.blit(cyan_surface, (random.randint(-offset, offset), random.randint(-offset, offset)),
-                             special_flags=pygame.BLEND_RGB_ADD)
-
-            # 3. Draw "QUITTING..." text that fades in
+            # Draw "QUITTING..." text that fades in
             if progress > 0.5:
                 text_alpha = min(255, int((progress - 0.5) * 2 * 255))
                 draw_text(surface, "QUITTING...", self.screen_rect.center,
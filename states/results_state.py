@@ -3,7 +3,9 @@ from settings import *
 from states.base_state import BaseState
 from ui.ui_manager import UIManager
 from ui.custom_widgets.Animated_arc_Widget import AnimatedArc
+from utils import blit_static
 import asset_loader
+from settings_manager import scaled
 
 
 class ResultsState(BaseState):
@@ -27,9 +29,11 @@ class ResultsState(BaseState):
         self.results_data = self.persist.get("results_data", {})
         self.song_data = self.persist.get("selected_song_data", {})
 
-        # --- Create blurred background ---
+        # --- Create blurred background (reusing the one gameplay was drawn over) ---
         original_img = asset_loader.load_image(self.song_data.get("image_path"))
-        if original_img:
+        if self.persist.get("gameplay_background"):
+            self.background_img = self.persist["gameplay_background"]
+        elif original_img:
             self.background_img = asset_loader.create_blurred_background(original_img, self.screen_rect.size)
 
         # --- Populate UI elements with results data ---
@@ -42,7 +46,7 @@ class ResultsState(BaseState):
             self.score_arc = AnimatedArc(
                 pos=placeholder.absolute_pos,
                 size=placeholder.size,
-                width=28,  # Thickness from your Figma design
+                width=scaled(28),  # Thickness from your Figma design
                 color=accent_color,
                 fill_percent=self.results_data.get("accuracy", 0)
             )
@@ -55,7 +59,7 @@ class ResultsState(BaseState):
             "score_grade": self.results_data.get("grade", "F"),
             "end_score": f"{self.results_data.get('score', 0):,}",
             "end_accuracy": f"{self.results_data.get('accuracy', 0):.2f}%",
-            "beatmaps_name": self.song_data.get("title", "N/A"),
+            "beatmaps_name": self.get_title_text(),
             "beatmapper_name": self.song_data.get("artist", "N/A"),
             "great_judgements": str(judgements.get("perfect", 0)),
             "good_judgement": str(judgements.get("great", 0)),
@@ -68,6 +72,14 @@ class ResultsState(BaseState):
             if element and hasattr(element, 'set_text'):
                 element.set_text(text)
 
+    def get_title_text(self):
+        title = self.song_data.get("title", "N/A")
+        rate = self.results_data.get("rate", 1.0)
+        if rate != 1.0:
+            title = f"{title} ({rate:g}x)"
+        # Practice scores only cover the play since the last seek or loop
+        return f"{title} (practice)" if self.results_data.get("practice") else title
+
     def get_event(self, event):
         super().get_event(event)
         if self.transition_state == "static":
@@ -78,8 +90,9 @@ class ResultsState(BaseState):
             if event.type == pygame.KEYUP and event.key == pygame.K_RETURN:
                 self.go_to_next_state()
 
-    def draw(self, surface):
-        surface.blit(self.background_img, (0, 0))
+    def draw(self, compositor):
+        surface = compositor.begin_layer("background")
+        blit_static(surface, self.background_img, (0, 0))
         self.ui_manager.draw(surface)
         if self.score_arc:
             self.score_arc.draw(surface)
@@ -7,8 +7,12 @@ from states.base_state import BaseState
 from ui.ui_manager import UIManager
 from ui.image_panel import ImagePanel
 from ui.label import Label
-from utils import draw_text
+from utils import draw_text, blit_static, mark_drawn
+from song_preview import PreviewPlayer
+from rate_audio import RateAudioRenderer, clamp_rate, RATE_STEP
+from background_tasks import TaskRunner
 import asset_loader
+from settings_manager import scaled
 
 
 class SongSelectState(BaseState):
@@ -28,6 +32,11 @@ class SongSelectState(BaseState):
         self.font_banner_title = asset_loader.load_font("Inter", 22)
         self.font_banner_artist = asset_loader.load_font("Inter", 16)
 
+        # --- Pre-composited banners, keyed by beatmap path ---
+        self.banner_cache = {}
+        self.banner_spacing = scaled(80)
+        self.banner_radius = scaled(10)
+
         # --- Song Data ---
         self.songs = []
         self.selected_index = 0
@@ -47,38 +56,62 @@ class SongSelectState(BaseState):
         self.background_change_delay = 0.3  # 300ms delay
         self.background_fade_duration = 0.4  # 400ms fade
 
+        # --- Song previews, debounced and extracted off the main thread ---
+        self.previews = PreviewPlayer()
+
+        # --- Playback rate (Left/Right), with the audio rendered ahead in the background ---
+        self.rate = 1.0
+        self.rate_renderer = RateAudioRenderer()
+
         # --- State Flags ---
         self.menu_music_was_playing = False
         self.is_transitioning_out = False
 
-        self.scan_for_songs()
-        self.load_all_song_assets()
-
-        if self.songs:
-            self.select_song(0, instant=True, play_preview=False)
+        # --- The library scan and artwork decode run on a worker thread ---
+        self.library_ready = False
+        self.library_loader = TaskRunner([("songs", self.load_library, 1)])
+        self.library_loader.start()
 
     def startup(self, persistent):
         super().startup(persistent)
         self.is_transitioning_out = False
         self.menu_music_was_playing = self.persist.get('menu_music_active', False)
+        self.rate = self.persist.get("rate", 1.0)
+
+        self.apply_library()
+        if self.songs:
+            self.select_song(self.get_startup_index(), instant=True, play_preview=not self.menu_music_was_playing)
 
-        song_to_select_index = 0
+        self.trigger_transition_in()
+
+    def get_startup_index(self):
+        """ The song the menu music is playing, if any, so the list starts on it. """
         if self.menu_music_was_playing:
             menu_beatmap_path = self.persist.get('menu_music_beatmap_path')
             if menu_beatmap_path:
                 for i, song in enumerate(self.songs):
                     if song['beatmap_path'] == menu_beatmap_path:
-                        song_to_select_index = i
-                        break
-
-        if self.songs:
-            self.select_song(song_to_select_index, instant=True, play_preview=not self.menu_music_was_playing)
-
-        self.trigger_transition_in()
+                        return i
+        return 0
+
+    def load_library(self, results):
+        """ Scans the beatmaps folder and decodes the artwork (runs on the worker thread). """
+        songs = self.scan_for_songs()
+        self.load_all_song_assets(songs)
+        return songs
+
+    def apply_library(self):
+        """ Takes the songs from the library loader once it has finished. Returns True the first time. """
+        if self.library_ready or not self.library_loader.is_done:
+            return False
+        self.songs = self.library_loader.results.get("songs") or []
+        self.library_ready = True
+        return True
 
     def scan_for_songs(self):
+        songs = []
         songs_path = "assets/beatmaps"
-        if not os.path.exists(songs_path): return
+        if not os.path.exists(songs_path): return songs
         for folder_name in os.listdir(songs_path):
             folder_path = os.path.join(songs_path, folder_name)
             if os.path.isdir(folder_path):
@@ -89,7 +122,7 @@ class SongSelectState(BaseState):
                             data = json.load(f)
                         img_file = next(
                             (f for f in os.listdir(folder_path) if f.lower().endswith(('.png', '.jpg', '.jpeg'))), None)
-                        self.songs.append({
+                        songs.append({
                             "title": data.get("title", folder_name),
                             "artist": data.get("artist", "Unknown Artist"),
                             "bpm": data.get("bpm", "N/A"),
@@ -102,41 +135,43 @@ class SongSelectState(BaseState):
                         })
                     except Exception as e:
                         print(f"Error loading song data in '{folder_name}': {e}")
-
-    def load_all_song_assets(self):
-        banner_size = self.banner_placeholder.size if self.banner_placeholder else (740, 70)
-        for i in range(len(self.songs)):
-            if self.songs[i]["image_path"]:
-                img = asset_loader.load_image(self.songs[i]["image_path"])
-                self.songs[i]["original_img"] = img
+        return songs
+
+    def load_all_song_assets(self, songs):
+        banner_size = self.banner_placeholder.size if self.banner_placeholder else (scaled(740), scaled(70))
+        for song in songs:
+            if song["image_path"]:
+                img = asset_loader.load_image(song["image_path"])
+                song["original_img"] = img
                 if img:
-                    self.songs[i]["banner_img"] = asset_loader.scale_to_cover(img, banner_size)
-                    self.songs[i]["accent_color"] = asset_loader.get_dominant_color(img, vibrant=True)
+                    song["banner_img"] = asset_loader.scale_to_cover(img, banner_size)
+                    song["accent_color"] = asset_loader.get_dominant_color(img, vibrant=True)
                 else:
-                    self.songs[i]["banner_img"], self.songs[i]["accent_color"] = None, DEFAULT_ACCENT_COLOR
+                    song["banner_img"], song["accent_color"] = None, DEFAULT_ACCENT_COLOR
             else:
-                self.songs[i]["original_img"], self.songs[i]["banner_img"], self.songs[i][
-                    "accent_color"] = None, None, DEFAULT_ACCENT_COLOR
+                song["original_img"], song["banner_img"], song["accent_color"] = None, None, DEFAULT_ACCENT_COLOR
 
     def select_song(self, index, instant=False, play_preview=True):
         if not self.songs or not (0 <= index < len(self.songs)): return
         self.selected_index = index
         song_data = self.songs[index]
 
-        banner_h_margin = 80
-        self.target_scroll_y = self.screen_rect.centery - (self.selected_index * banner_h_margin)
+        self.target_scroll_y = self.screen_rect.centery - (self.selected_index * self.banner_spacing)
         if instant:
             self.current_scroll_y = self.target_scroll_y
 
         ui_text_map = {
             "Beatmaps_name": song_data["title"], "Beatmapper_Name": song_data["artist"],
-            "beatmap_bpm": str(song_data["bpm"]), "beatmap_length": str(song_data["length"]),
+            "beatmap_bpm": self.get_bpm_text(song_data), "beatmap_length": str(song_data["length"]),
             "beatmap_notes_amount": str(song_data["notes"]),
         }
         for name, text in ui_text_map.items():
             element = self.ui_manager.get_element_by_name(name)
             if element and hasattr(element, 'set_text'): element.set_text(text)
 
+        if self.rate != 1.0:
+            self.rate_renderer.request(song_data["audio_path"], self.rate)
+
         artwork_placeholder = self.ui_manager.get_element_by_name("IMG_beatmap_art_placeholder")
 
         # --- Handle visual transitions (from old state) ---
@@ -166,12 +201,25 @@ class SongSelectState(BaseState):
             self.background_fade_alpha = 0
 
         if play_preview:
-            audio_path = song_data["audio_path"]
-            if os.path.exists(audio_path):
-                pygame.mixer.music.load(audio_path)
-                pygame.mixer.music.play(start=song_data["preview_time_ms"] / 1000.0)
-            else:
-                pygame.mixer.music.stop()
+            neighbours = [self.songs[(index + step) % len(self.songs)] for step in (1, -1)]
+            self.previews.select(song_data["audio_path"], song_data["preview_time_ms"],
+                                 prefetch=[(song["audio_path"], song["preview_time_ms"]) for song in neighbours])
+
+    def get_bpm_text(self, song_data):
+        bpm = song_data["bpm"]
+        if self.rate == 1.0 or not isinstance(bpm, (int, float)):
+            return str(bpm)
+        return f"{bpm * self.rate:g} ({self.rate:g}x)"
+
+    def change_rate(self, step):
+        """ Changes the playback rate and starts rendering the selected song at it, without waiting. """
+        self.rate = clamp_rate(self.rate + step)
+        self.persist["rate"] = self.rate
+        song_data = self.songs[self.selected_index]
+        bpm_label = self.ui_manager.get_element_by_name("beatmap_bpm")
+        if bpm_label and hasattr(bpm_label, 'set_text'):
+            bpm_label.set_text(self.get_bpm_text(song_data))
+        self.rate_renderer.request(song_data["audio_path"], self.rate)
 
     def get_event(self, event):
         super().get_event(event)
@@ -181,6 +229,11 @@ class SongSelectState(BaseState):
                     self.next_state = "MAIN_MENU"
                     self.trigger_transition_out()
                     pygame.mixer.music.fadeout(500)
+                    self.previews.fadeout(500)
+                    return
+
+                if event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                    self.change_rate(RATE_STEP if event.key == pygame.K_RIGHT else -RATE_STEP)
                     return
 
                 play_preview = True
@@ -197,18 +250,30 @@ class SongSelectState(BaseState):
                 elif event.key == pygame.K_RETURN:
                     self.next_state = 'LOADING'
                     self.persist['menu_music_active'] = False
+                    # Shift + Enter starts the chart in practice mode (seeking and section loops)
+                    self.persist["practice_mode"] = bool(pygame.key.get_mods() & pygame.KMOD_SHIFT)
                     self.persist["selected_song_data"] = self.songs[self.selected_index]
+                    self.persist["rate"] = self.rate
                     self.persist["final_background"] = self.current_background  # Use current_background
                     pygame.mixer.music.fadeout(500)
+                    self.previews.fadeout(500)
                     self.trigger_transition_out()
 
     def update(self, dt):
         super().update(dt)
         self.ui_manager.update(dt)
+        self.previews.update()
+
+        # Entered before the library finished loading: show it as soon as it has
+        if self.apply_library() and self.songs:
+            self.select_song(self.get_startup_index(), instant=True, play_preview=not self.menu_music_was_playing)
 
         # Update smooth scrolling
         diff = self.target_scroll_y - self.current_scroll_y
-        self.current_scroll_y += diff * min(1, self.scroll_smoothness * (dt / 1000.0))
+        if abs(diff) < 0.5:
+            self.current_scroll_y = self.target_scroll_y  # Snap so the list can go idle
+        else:
+            self.current_scroll_y += diff * min(1, self.scroll_smoothness * (dt / 1000.0))
 
         # --- Update background transition (from old state) ---
         if self.pending_background and time.time() > self.background_change_timer + self.background_change_delay:
@@ -225,14 +290,21 @@ class SongSelectState(BaseState):
                     artwork_placeholder.set_image(self.pending_artwork)
                 self.pending_artwork = None
 
-    def draw(self, surface):
+    def is_animating(self):
+        return (super().is_animating() or not self.library_ready or self.pending_background is not None
+                or self.previews.is_waiting()
+                or self.current_scroll_y != self.target_scroll_y or self.ui_manager.is_animating())
+
+    def draw(self, compositor):
+        surface = compositor.begin_layer("background")
+
         # --- Draw current background (from old state) ---
-        surface.blit(self.current_background, (0, 0))
+        blit_static(surface, self.current_background, (0, 0))
 
         # --- Draw fading pending background (from old state) ---
         if self.pending_background and self.background_fade_alpha > 0:
             self.pending_background.set_alpha(int(self.background_fade_alpha))
-            surface.blit(self.pending_background, (0, 0))
+            blit_static(surface, self.pending_background, (0, 0))
 
         self.ui_manager.draw(surface)
         self.draw_song_list(surface)
@@ -240,31 +312,49 @@ class SongSelectState(BaseState):
     def draw_song_list(self, surface):
         if not self.songs or not self.banner_placeholder: return
         list_x = self.banner_placeholder.absolute_pos[0]
-        banner_h_margin = 80
+        banner_spacing = self.banner_spacing
         for i, song in enumerate(self.songs):
-            y_pos = self.current_scroll_y + (i * banner_h_margin) - (banner_h_margin / 2)
-            if y_pos > self.screen_rect.height or y_pos < -banner_h_margin: continue
+            y_pos = self.current_scroll_y + (i * banner_spacing) - (banner_spacing / 2)
+            if y_pos > self.screen_rect.height or y_pos < -banner_spacing: continue
             banner_rect = pygame.Rect(list_x, y_pos, self.banner_placeholder.size[0], self.banner_placeholder.size[1])
 
-            if song.get("banner_img"):
-                clip_surface = pygame.Surface(banner_rect.size, pygame.SRCALPHA)
-                pygame.draw.rect(clip_surface, WHITE, (0, 0, *banner_rect.size), border_radius=10)
-                clip_surface.blit(song["banner_img"], (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
-                surface.blit(clip_surface, banner_rect.topleft)
-            else:
-                pygame.draw.rect(surface, (30, 30, 30), banner_rect, border_radius=10)
+            blit_static(surface, self.get_banner_surface(song), banner_rect.topleft)
+
+            if i == self.selected_index:
+                mark_drawn(surface, pygame.draw.rect(surface, song["accent_color"], banner_rect, max(1, scaled(3)),
+                                                     border_radius=self.banner_radius))
+
+    def get_banner_surface(self, song):
+        """
+        Returns the song's banner (rounded artwork, dark overlay, title and artist)
+        composited into a single surface. The result is cached and only rebuilt
+        when the song's artwork changes.
+        """
+        cache_key = song["beatmap_path"]
+        cached = self.banner_cache.get(cache_key)
+        if cached and cached[0] is song.get("banner_img"):
+            return cached[1]
+
+        size = self.banner_placeholder.size
+        banner = pygame.Surface(size, pygame.SRCALPHA)
+        if song.get("banner_img"):
+            banner.blit(asset_loader.round_corners(song["banner_img"], self.banner_radius), (0, 0))
+        else:
+            pygame.draw.rect(banner, (30, 30, 30), (0, 0, *size), border_radius=self.banner_radius)
 
-            overlay = pygame.Surface(banner_rect.size, pygame.SRCALPHA)
-            pygame.draw.rect(overlay, (0, 0, 0, 150), (0, 0, *banner_rect.size), border_radius=10)
-            surface.blit(overlay, banner_rect.topleft)
+        overlay = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(overlay, (0, 0, 0, 150), (0, 0, *size), border_radius=self.banner_radius)
+        banner.blit(overlay, (0, 0))
 
-            draw_text(surface, song["title"], (banner_rect.x + 20, banner_rect.centery - 10),
-                      self.font_banner_title, WHITE, text_rect_origin='topleft')
-            draw_text(surface, song["artist"], (banner_rect.x + 20, banner_rect.centery + 12),
-                      self.font_banner_artist, (200, 200, 200), text_rect_origin='topleft')
+        center_y = size[1] // 2
+        draw_text(banner, song["title"], (scaled(20), center_y - scaled(10)), self.font_banner_title, WHITE,
+                  text_rect_origin='topleft')
+        draw_text(banner, song["artist"], (scaled(20), center_y + scaled(12)), self.font_banner_artist,
+                  (200, 200, 200), text_rect_origin='topleft')
 
-            if i == self.selected_index:
-                pygame.draw.rect(surface, song["accent_color"], banner_rect, 3, border_radius=10)
+        banner = asset_loader.optimize_surface(banner, rle=True)
+        self.banner_cache[cache_key] = (song.get("banner_img"), banner)
+        return banner
 
     # --- Transition animation methods from previous implementation ---
     def trigger_transition_in(self):
@@ -272,11 +362,11 @@ class SongSelectState(BaseState):
         info_panel = self.ui_manager.get_element_by_name("info_panel")
         if info_panel:
             target_x = info_panel.pos[0]
-            info_panel.absolute_pos[0] = -info_panel.size[0]
+            info_panel.absolute_pos = (-info_panel.size[0], info_panel.absolute_pos[1])
             info_panel.animate_position((target_x, info_panel.absolute_pos[1]), duration)
         if self.banner_placeholder:
             target_x = self.banner_placeholder.pos[0]
-            self.banner_placeholder.absolute_pos[0] = self.screen_rect.width
+            self.banner_placeholder.absolute_pos = (self.screen_rect.width, self.banner_placeholder.absolute_pos[1])
             self.banner_placeholder.animate_position((target_x, self.banner_placeholder.absolute_pos[1]), duration)
 
     def trigger_transition_out(self):
@@ -8,6 +8,8 @@ class Button(Panel):
     generates a hover color.
     """
 
+    interactive = True
+
     def __init__(self, name="", pos=(0, 0), size=(0, 0), parent=None, bg_color=(50, 50, 50, 255), hover_color=None,
                  radius=0, on_click=None):
         super().__init__(name=name, pos=pos, size=size, parent=parent, bg_color=bg_color, radius=radius)
@@ -24,28 +26,12 @@ class Button(Panel):
         self.on_click = on_click
         self.is_hovered = False
 
-    def get_event(self, event):
-        """ Checks for mouse hover and click events. """
-        if self.visible:
-            if event.type == pygame.MOUSEMOTION:
-                self.is_hovered = self.get_rect().collidepoint(event.pos)
-
-            if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-                if self.is_hovered and self.on_click:
-                    self.on_click()
-
-        super().get_event(event)
-
-    def update(self, dt):
-        """ Updates background color based on hover state. """
-        if self.is_hovered:
-            self.bg_color = self.hover_color
-        else:
-            self.bg_color = self.base_color
-
-        super().update(dt)
+    def set_hovered(self, hovered):
+        self.is_hovered = hovered
+        self.bg_color = self.hover_color if hovered else self.base_color
 
-    def get_rect(self):
-        """ Returns the button's rectangle for collision detection. """
-        return pygame.Rect(self.absolute_pos, self.size)
+    def get_pointer_event(self, event):
+        """ Clicks on release of the left button over the button. """
+        if event.type == pygame.MOUSEBUTTONUP and event.button == 1 and self.on_click:
+            self.on_click()
 
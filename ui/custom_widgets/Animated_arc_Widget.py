@@ -1,5 +1,6 @@
 import pygame
 import math
+from utils import mark_drawn
 
 
 class AnimatedArc:
@@ -19,12 +20,24 @@ class AnimatedArc:
         self.current_angle = start_angle
         self.fill_percent = fill_percent
         self.animation_mode = 'spin' if speed != 0 else 'fill'
+        # Spinners can show progress (0-100): the arc grows towards a full circle as it rises
+        self.progress = None
+        self.displayed_progress = 0.0
 
     def update(self, dt):
         """ Animate the arc's angle if it's in spin mode. """
         if self.animation_mode == 'spin':
             dt_seconds = dt / 1000.0
             self.current_angle += self.speed * dt_seconds
+            if self.progress is not None:
+                # Ease towards the reported progress so jumps between tasks look smooth
+                self.displayed_progress += (self.progress - self.displayed_progress) * min(1.0, 8 * dt_seconds)
+
+    def set_progress(self, percent):
+        """ Sets the progress a spinner shows. Setting 0 also resets the displayed value. """
+        self.progress = max(0, min(100, percent))
+        if percent <= 0:
+            self.displayed_progress = 0.0
 
     def set_fill_percent(self, percent):
         """ Instantly sets the fill percentage for the arc. """
@@ -33,10 +46,11 @@ class AnimatedArc:
     def draw(self, surface):
         """ Draw the arc to a surface. """
         if self.animation_mode == 'spin':
-            # Draw a 270-degree arc for the loading spinner
+            # Draw a 270-degree arc for the loading spinner, or one sized by the progress
+            sweep = 270 if self.progress is None else 30 + 330 * (self.displayed_progress / 100)
             start_rad = math.radians(self.current_angle)
-            end_rad = math.radians(self.current_angle + 270)
-            pygame.draw.arc(surface, self.color, self.rect, start_rad, end_rad, self.width)
+            end_rad = math.radians(self.current_angle + sweep)
+            mark_drawn(surface, pygame.draw.arc(surface, self.color, self.rect, start_rad, end_rad, self.width))
 
         elif self.animation_mode == 'fill':
             if self.fill_percent > 0.5:  # Don't draw a tiny dot for 0%
@@ -46,5 +60,6 @@ class AnimatedArc:
                 start_angle_rad = math.radians(90 - fill_degrees)
                 end_angle_rad = math.radians(90)
 
-                pygame.draw.arc(surface, self.color, self.rect, start_angle_rad, end_angle_rad, self.width)
+                mark_drawn(surface, pygame.draw.arc(surface, self.color, self.rect, start_angle_rad, end_angle_rad,
+                                                    self.width))
 
@@ -1,5 +1,6 @@
 import pygame
 from settings import *
+from utils import mark_drawn
 
 
 class Slider:
@@ -42,7 +43,10 @@ class Slider:
     def get_event(self, event):
         # Use absolute rect for collision detection
         absolute_rect = self.rect
-        mouse_pos = pygame.mouse.get_pos()
+        # Event positions are already mapped to render coordinates by the game loop
+        mouse_pos = getattr(event, "pos", None)
+        if mouse_pos is None:
+            return
 
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if absolute_rect.collidepoint(mouse_pos):
@@ -80,6 +84,6 @@ class Slider:
 
         # Draw the handle on top
         handle_center_y = self.rect.centery
-        pygame.draw.circle(surface, (220, 220, 220), (int(self.rect.x + self.handle_pos_x), handle_center_y),
-                           self.handle_radius)
+        handle_pos = (int(self.rect.x + self.handle_pos_x), handle_center_y)
+        mark_drawn(surface, pygame.draw.circle(surface, (220, 220, 220), handle_pos, self.handle_radius))
 
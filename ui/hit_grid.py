@@ -0,0 +1,49 @@
+import pygame
+
+HIT_GRID_CELL_SIZE = 128  # Pixels per cell side; most buttons cover one to four cells
+
+
+class HitGrid:
+    """
+    A uniform grid over screen space for finding the elements under a point without
+    walking the UI tree. Each element is listed in every cell its rect overlaps, so a
+    lookup only tests the few elements sharing the cursor's cell.
+    """
+
+    def __init__(self, cell_size=HIT_GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> elements overlapping that cell, in insertion order
+        self.rects = {}  # element -> the rect it was inserted with
+
+    def get_cells(self, rect):
+        size = self.cell_size
+        for column in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield column, row
+
+    def insert(self, element, rect):
+        """ Adds the element at rect, replacing wherever it was before. """
+        self.remove(element)
+        rect = pygame.Rect(rect)
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        self.rects[element] = rect
+        for cell in self.get_cells(rect):
+            self.cells.setdefault(cell, []).append(element)
+
+    def remove(self, element):
+        rect = self.rects.pop(element, None)
+        if rect is None:
+            return
+        for cell in self.get_cells(rect):
+            elements = self.cells.get(cell)
+            if elements and element in elements:
+                elements.remove(element)
+                if not elements:
+                    del self.cells[cell]
+
+    def query(self, pos):
+        """ Returns the elements whose rect contains pos. """
+        x, y = int(pos[0]), int(pos[1])
+        cell = (x // self.cell_size, y // self.cell_size)
+        return [element for element in self.cells.get(cell, ()) if self.rects[element].collidepoint(x, y)]
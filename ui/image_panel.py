@@ -17,13 +17,23 @@ class ImagePanel(Panel):
         # Pass all styling arguments (bg_color, radius, etc.) up to the parent Panel
         super().__init__(name=name, pos=pos, size=size, parent=parent, **kwargs)
         self.image = None
+        self.source_image = None
+        # (size, radius) the cached image was built for, so a resize triggers a rebuild
+        self._image_key = None
 
     def set_image(self, image_surface):
         """
         Dynamically sets the panel's image from a pre-loaded pygame.Surface.
+        The scaled and corner-clipped result is cached until the image or size changes.
         """
-        if image_surface:
-            self.image = asset_loader.scale_to_cover(image_surface, self.size)
+        self.source_image = image_surface
+        self._build_image()
+
+    def _build_image(self):
+        self._image_key = (tuple(self.size), self.radius)
+        if self.source_image:
+            scaled = asset_loader.scale_to_cover(self.source_image, self.size)
+            self.image = asset_loader.round_corners(scaled, self.radius)
         else:
             self.image = None
 
@@ -38,13 +48,8 @@ class ImagePanel(Panel):
         # First, draw the panel's own background color and border from the parent class.
         super().draw(surface)
 
+        if self.source_image and self._image_key != (tuple(self.size), self.radius):
+            self._build_image()
+
         if self.image:
-            rect = pygame.Rect(self.absolute_pos, self.size)
-
-            if self.radius > 0:
-                clip_surface = pygame.Surface(self.size, pygame.SRCALPHA)
-                pygame.draw.rect(clip_surface, (255, 255, 255, 255), (0, 0, *self.size), border_radius=self.radius)
-                clip_surface.blit(self.image, (0, 0), special_flags=pygame.BLEND_RGBA_MIN)
-                surface.blit(clip_surface, rect)
-            else:
-                surface.blit(self.image, rect)
\ No newline at end of file
+            surface.blit(self.image, self.absolute_pos)
\ No newline at end of file
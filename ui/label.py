@@ -1,10 +1,35 @@
 import pygame
 from ui.ui_element import UIElement
 import asset_loader
+from utils import get_text_footprint
+
+
+def _text_property(name):
+    """ An attribute that marks the label for re-rendering when it changes. """
+    attribute = "_" + name
+
+    def get(self):
+        return getattr(self, attribute)
+
+    def set(self, value):
+        if attribute not in self.__dict__ or self.__dict__[attribute] != value:
+            setattr(self, attribute, value)
+            self.text_dirty = True
+
+    return property(get, set)
 
 
 class Label(UIElement):
-    """ A UI element for displaying text. """
+    """
+    A UI element for displaying text. Changing the text, font or colour only marks the
+    label dirty; it is rendered once, when next drawn, through asset_loader's shared
+    text cache.
+    """
+
+    text = _text_property("text")
+    font_name = _text_property("font_name")
+    font_size = _text_property("font_size")
+    color = _text_property("color")
 
     def __init__(self, name="", pos=(0, 0), size=(0, 0), parent=None, text="", font_name=None, font_size=16,
                  color=(255, 255, 255, 255), align="left"):
@@ -13,38 +38,50 @@ class Label(UIElement):
         self.font_name = font_name
         self.font_size = font_size
         self.color = color
-        self.align = align
+        self.align = align  # Only affects placement, so it needs no re-render
         self.font = None
         self.text_surface = None
-        self.create_text_surface()
-
-
+        self.native_text_surface = None  # Output-resolution render, made on first native draw
+        self.text_dirty = True
 
     def set_text(self, new_text):
-        if self.text != new_text:
-            self.text = str(new_text)
-            self.create_text_surface()
+        self.text = str(new_text)
 
     def create_text_surface(self):
         self.font = asset_loader.load_font(self.font_name, self.font_size)
         if self.font:
-            self.text_surface = self.font.render(self.text, True, self.color)
+            self.text_surface = asset_loader.render_text(self.font, str(self.text), self.color)
+        self.native_text_surface = None
+        self.text_dirty = False
 
     def draw(self, surface):
+        if self.text_dirty:
+            self.create_text_surface()
         if self.text_surface:
+            text_surface = self.text_surface
+            native = getattr(surface, "native_text", False)
+            if native:
+                if self.native_text_surface is None:
+                    native_font = asset_loader.get_native_font(self.font)
+                    self.native_text_surface = asset_loader.render_text(native_font, str(self.text), self.color)
+                text_surface = self.native_text_surface
+            text_width, text_height = get_text_footprint(surface, text_surface)
+
             # --- FIX: Use absolute_pos for drawing ---
             draw_pos = list(self.absolute_pos)
 
             # Handle text alignment within the element's bounding box
             if self.align == 'center':
-                draw_pos[0] += (self.size[0] - self.text_surface.get_width()) // 2
+                draw_pos[0] += (self.size[0] - text_width) // 2
             elif self.align == 'right':
-                draw_pos[0] += self.size[0] - self.text_surface.get_width()
+                draw_pos[0] += self.size[0] - text_width
 
             # Vertically center the text
-            draw_pos[1] += (self.size[1] - self.text_surface.get_height()) // 2
+            draw_pos[1] += (self.size[1] - text_height) // 2
 
-            surface.blit(self.text_surface, draw_pos)
+            if native:
+                surface.queue_native_text(text_surface, draw_pos)
+            else:
+                surface.blit(text_surface, draw_pos)
 
         super().draw(surface)  # Draw children
-
@@ -1,4 +1,6 @@
 import json
+import os
+import hashlib
 import pygame
 from ui.ui_element import UIElement
 from ui.label import Label
@@ -6,11 +8,20 @@ from ui.panel import Panel
 from ui.button import Button
 from ui.image_panel import ImagePanel
 import asset_loader
+import settings_manager
 
 FIGMA_TO_UI_MAP = {
     "RECTANGLE": Panel, "TEXT": Label, "GROUP": UIElement,
     "FRAME": UIElement, "ELLIPSE": Panel
 }
+ELEMENT_CLASSES = {cls.__name__: cls for cls in (UIElement, Panel, Label, Button, ImagePanel)}
+
+# Compiled layouts are stored in design pixels, so they stay valid when the render scale changes.
+# Bump the version whenever the compiled format or the compile step changes.
+LAYOUT_CACHE_PATH = os.path.join("cache", "layouts")
+LAYOUT_CACHE_VERSION = 2
+_compiled_layouts = {}  # file path -> (source mtime, compiled root)
+_CACHE_MISS = object()  # Returned by _read_layout_cache, since a compiled root can itself be None
 
 
 def _parse_figma_color(color_string, default_color=(0, 0, 0, 0)):
@@ -40,75 +51,152 @@ def _get_position_from_data(data):
 
 
 def load_layout_from_figma(file_path):
+    """
+    Builds the element tree for a Figma layout export. The export is compiled once
+    (see compile_layout) and the result cached in memory and on disk, so later loads
+    only construct elements.
+    """
+    compiled = load_compiled_layout(file_path)
+    return build_element(compiled) if compiled else None
+
+
+def load_compiled_layout(file_path):
+    """ Returns the compiled layout for file_path, recompiling it if the source has changed. """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            layout_data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError) as e:
+        mtime = os.path.getmtime(file_path)
+    except OSError as e:
         print(f"Error loading Figma layout file '{file_path}': {e}")
         return None
-    root_structure = layout_data.get("structure")
-    if not root_structure: return None
-    return _create_element_from_figma_data(root_structure)
 
+    cached = _compiled_layouts.get(file_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
 
-def _create_element_from_figma_data(data, parent=None):
-    name = data.get("name", "")
+    cache_file = get_layout_cache_file(file_path)
+    compiled = _read_layout_cache(cache_file, file_path, mtime)
+    if compiled is _CACHE_MISS:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                layout_data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"Error loading Figma layout file '{file_path}': {e}")
+            return None
+        root_structure = layout_data.get("structure")
+        compiled = _compile_node(root_structure) if root_structure else None
+        _write_layout_cache(cache_file, file_path, mtime, compiled)
+
+    _compiled_layouts[file_path] = (mtime, compiled)
+    return compiled
+
+
+def get_layout_cache_file(file_path):
+    """ Layouts with the same name in different folders get different cache files. """
+    return os.path.join(LAYOUT_CACHE_PATH, hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest() + ".json")
 
-    element_class = None
+
+def _read_layout_cache(cache_file, file_path, mtime):
+    """ Returns the cached compiled layout (possibly None), or _CACHE_MISS if it is missing or stale. """
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return _CACHE_MISS
+    if (cached.get("version") != LAYOUT_CACHE_VERSION or cached.get("source") != os.path.abspath(file_path)
+            or cached.get("mtime") != mtime or "has_root" not in cached):
+        return _CACHE_MISS
+    return cached.get("root") if cached["has_root"] else None
+
+
+def _write_layout_cache(cache_file, file_path, mtime, compiled):
+    try:
+        os.makedirs(LAYOUT_CACHE_PATH, exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({"version": LAYOUT_CACHE_VERSION, "source": os.path.abspath(file_path), "mtime": mtime,
+                       "has_root": compiled is not None, "root": compiled}, f)
+    except OSError as e:
+        print(f"Warning: Could not write the layout cache '{cache_file}': {e}")
+
+
+def _compile_node(data):
+    """
+    Resolves everything about a Figma node that doesn't depend on the render scale:
+    the element class, parsed colours, the absolute position and size in design pixels
+    and the text style. Nodes with no matching element class are dropped with their children.
+    """
+    name = data.get("name", "")
     if name.startswith("IMG_"):
         element_class = ImagePanel
     elif name.endswith("_button"):
         element_class = Button
     else:
         element_class = FIGMA_TO_UI_MAP.get(data.get("type"))
-
     if not element_class: return None
 
-    size = [data.get("size", {}).get("w", 0), data.get("size", {}).get("h", 0)]
-    absolute_pos = _get_position_from_data(data)
-    if absolute_pos is None: absolute_pos = [0, 0]
-
-    if parent:
-        relative_pos = [absolute_pos[0] - parent.absolute_pos[0], absolute_pos[1] - parent.absolute_pos[1]]
-    else:
-        relative_pos = absolute_pos
-
-    element_args = {'name': name, 'pos': relative_pos, 'size': size, 'parent': parent}
+    node = {
+        "class": element_class.__name__,
+        "name": name,
+        "pos": _get_position_from_data(data) or [0, 0],
+        "size": [data.get("size", {}).get("w", 0), data.get("size", {}).get("h", 0)],
+    }
     styles = data.get("styles", {})
 
     if issubclass(element_class, Panel):
-        element_args['bg_color'] = _parse_figma_color(styles.get("bg"))
-        element_args['radius'] = int(styles.get("radius", 0))
+        node["panel"] = {"bg_color": _parse_figma_color(styles.get("bg")), "radius": styles.get("radius", 0)}
         border = styles.get("border", {})
         if border:
-            element_args['border_width'] = int(border.get("width", 0))
-            element_args['border_color'] = _parse_figma_color(border.get("color"))
-
-    element = element_class(**element_args)
+            node["panel"]["border_width"] = border.get("width", 0)
+            node["panel"]["border_color"] = _parse_figma_color(border.get("color"))
 
-    if isinstance(element, Label):
-        element.set_text(data.get("content", ""))
+    if issubclass(element_class, Label):
         text_styles = styles.get("text", {})
-        element.font_size = int(text_styles.get("size", 16))
-        element.font_name = text_styles.get("family")
-        element.align = text_styles.get("align", "left").lower()
-
         # --- FIX: Prioritize text color from the nested "text" style object ---
-        if 'color' in text_styles:
-            element.color = _parse_figma_color(text_styles.get("color"), (255, 255, 255, 255))
-        else:  # Fallback to the main 'bg' color
-            element.color = _parse_figma_color(styles.get("bg"), (255, 255, 255, 255))
+        color = text_styles.get("color") if 'color' in text_styles else styles.get("bg")
+        node["text"] = {
+            "text": str(data.get("content", "")),
+            "font_size": int(text_styles.get("size", 16)),
+            "font_name": text_styles.get("family"),
+            "align": text_styles.get("align", "left").lower(),
+            "color": _parse_figma_color(color, (255, 255, 255, 255)),
+        }
+
+    if issubclass(element_class, ImagePanel):
+        node["image"] = name.replace("IMG_", "")
+
+    node["children"] = [child for child in map(_compile_node, data.get("children", [])) if child]
+    return node
+
+
+def build_element(node, parent=None):
+    """ Constructs the elements for a compiled layout node and its children. """
+    # Layouts are designed at 1920x1080; geometry is scaled to the render resolution.
+    # Font sizes stay in design pixels because asset_loader.load_font scales them.
+    scale = settings_manager.get_render_scale()
+    scaled = settings_manager.scaled
+    absolute_pos = [node["pos"][0] * scale, node["pos"][1] * scale]
+    if parent:
+        relative_pos = [absolute_pos[0] - parent.absolute_pos[0], absolute_pos[1] - parent.absolute_pos[1]]
+    else:
+        relative_pos = absolute_pos
 
-        element.create_text_surface()
+    element_args = {'name': node["name"], 'pos': relative_pos, 'size': [scaled(node["size"][0]), scaled(node["size"][1])],
+                    'parent': parent}
+    panel = node.get("panel")
+    if panel:
+        element_args['bg_color'] = tuple(panel["bg_color"])
+        element_args['radius'] = scaled(panel["radius"])
+        if "border_width" in panel:
+            element_args['border_width'] = scaled(panel["border_width"])
+            element_args['border_color'] = tuple(panel["border_color"])
+    text = node.get("text")
+    if text:
+        element_args.update(text, color=tuple(text["color"]))
 
-    if isinstance(element, ImagePanel):
-        image_name = element.name.replace("IMG_", "")
-        element.set_image_from_path(asset_loader.get_image_path(image_name))
+    element = ELEMENT_CLASSES[node["class"]](**element_args)
 
-    for child_data in data.get("children", []):
-        child_element = _create_element_from_figma_data(child_data, parent=element)
-        if child_element:
-            element.add_child(child_element)
+    if "image" in node:
+        element.set_image_from_path(asset_loader.get_image_path(node["image"]))
 
-    return element
+    for child_node in node["children"]:
+        element.add_child(build_element(child_node, parent=element))
 
+    return element
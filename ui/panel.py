@@ -1,5 +1,6 @@
 import pygame
 from ui.ui_element import UIElement
+from utils import mark_drawn
 
 
 class Panel(UIElement):
@@ -23,10 +24,11 @@ class Panel(UIElement):
         # Checks if the color exists and has an alpha value > 0.
         # Works for both 3-part RGB (assumed opaque) and 4-part RGBA.
         if self.bg_color and (len(self.bg_color) == 3 or self.bg_color[3] > 0):
-            pygame.draw.rect(surface, self.bg_color, rect, border_radius=self.radius)
+            mark_drawn(surface, pygame.draw.rect(surface, self.bg_color, rect, border_radius=self.radius))
 
         if self.border_width > 0 and self.border_color and (len(self.border_color) == 3 or self.border_color[3] > 0):
-            pygame.draw.rect(surface, self.border_color, rect, width=self.border_width, border_radius=self.radius)
+            mark_drawn(surface, pygame.draw.rect(surface, self.border_color, rect, width=self.border_width,
+                                                 border_radius=self.radius))
 
         super().draw(surface)
 
@@ -19,7 +19,6 @@ class SettingsMenu:
             self.on_screen_pos = list(self.settings_panel.absolute_pos)
             self.off_screen_pos = [-self.settings_panel.size[0], self.on_screen_pos[1]]
             self.settings_panel.absolute_pos = list(self.off_screen_pos)
-            self.settings_panel._calculate_absolute_pos()
 
         # --- Sliders ---
         self.volume_slider = None
@@ -43,7 +42,6 @@ class SettingsMenu:
                 label = Label(name=f"keybind_{i}_label", pos=(0, 0), size=btn.size, parent=btn)
                 label.set_text(settings_manager.get_keybinds().get(str(i), "").upper())
                 label.align = "center"
-                label.create_text_surface()
                 self.keybind_labels[i] = label
 
     def toggle(self):
@@ -71,7 +69,6 @@ class SettingsMenu:
                 label.set_text("...")
             else:  # Dim other buttons
                 label.color = (100, 100, 100, 255)
-                label.create_text_surface()
 
     def finish_rebinding(self, key_name):
         settings_manager.set_keybind(self.rebinding_lane, key_name)
@@ -111,17 +108,14 @@ class SettingsMenu:
         if self.is_animating and not self.settings_panel.is_animating:
             self.is_animating = False
 
-    def draw(self, surface):
+    def draw(self, compositor):
         if not self.is_active and not self.is_animating: return
 
         pos_x = self.settings_panel.absolute_pos[0]
         on_x, off_x = self.on_screen_pos[0], self.off_screen_pos[0]
         progress = (pos_x - off_x) / (on_x - off_x) if (on_x - off_x) != 0 else 0
         overlay_alpha = int(180 * progress)
-        if overlay_alpha > 0:
-            overlay = pygame.Surface(SCREEN_SIZE, pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, max(0, overlay_alpha)))
-            surface.blit(overlay, (0, 0))
+        surface = compositor.begin_layer("settings_menu", dim=max(0, overlay_alpha))
 
         self.ui_manager.draw(surface)
         if self.volume_slider: self.volume_slider.draw(surface)
@@ -0,0 +1,121 @@
+def linear(t):
+    return t
+
+
+def ease_in_quad(t):
+    return t * t
+
+
+def ease_out_quad(t):
+    return t * (2 - t)
+
+
+def ease_in_out_quad(t):
+    return 2 * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 2 / 2
+
+
+def ease_out_cubic(t):
+    t -= 1
+    return t * t * t + 1
+
+
+def ease_in_out_cubic(t):
+    return 4 * t * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 3 / 2
+
+
+# Easing functions by name, so callers (and layouts) can pick one with a string.
+# Any callable mapping progress 0-1 to eased progress works as well.
+EASINGS = {
+    "linear": linear,
+    "ease_in_quad": ease_in_quad,
+    "ease_out_quad": ease_out_quad,
+    "ease_in_out_quad": ease_in_out_quad,
+    "ease_out_cubic": ease_out_cubic,
+    "ease_in_out_cubic": ease_in_out_cubic,
+}
+
+
+def get_easing(easing):
+    if callable(easing):
+        return easing
+    if easing not in EASINGS:
+        print(f"Warning: Unknown easing '{easing}'. Using ease_out_cubic.")
+    return EASINGS.get(easing, ease_out_cubic)
+
+
+def lerp(start, end, t):
+    """
+    Interpolates numbers, or sequences of them element-wise (positions, RGBA colours).
+    Integers stay integers, so colours remain valid; the result has the type of end.
+    """
+    if isinstance(end, (list, tuple)):
+        return type(end)(lerp(a, b, t) for a, b in zip(start, end))
+    value = start + (end - start) * t
+    return round(value) if isinstance(start, int) and isinstance(end, int) else value
+
+
+class Tween:
+    """ Moves one attribute of a target from its current value to end over duration seconds. """
+
+    def __init__(self, target, attribute, end, duration, easing=ease_out_cubic, on_complete=None):
+        self.target = target
+        self.attribute = attribute
+        self.start = getattr(target, attribute)
+        if isinstance(self.start, list):
+            self.start = list(self.start)  # The target may change the list in place
+        self.end = end
+        self.duration = duration
+        self.easing = get_easing(easing)
+        self.on_complete = on_complete
+        self.elapsed = 0.0
+
+    def step(self, dt):
+        """ Advances by dt milliseconds and applies the value. Returns True once finished. """
+        self.elapsed += dt / 1000.0
+        progress = min(self.elapsed / self.duration, 1.0) if self.duration > 0 else 1.0
+        if progress >= 1.0:
+            setattr(self.target, self.attribute, self.end)
+            return True
+        setattr(self.target, self.attribute, lerp(self.start, self.end, self.easing(progress)))
+        return False
+
+
+class TweenScheduler:
+    """
+    Holds the UI's active tweens and advances only those each frame, so a UI with
+    nothing moving costs nothing to update. A new tween on the same target and
+    attribute replaces the running one, starting from wherever it got to.
+    """
+
+    def __init__(self):
+        self.tweens = {}  # (target, attribute) -> Tween
+
+    def add(self, tween):
+        self.tweens[(tween.target, tween.attribute)] = tween
+        return tween
+
+    def cancel(self, target, attribute=None):
+        """ Stops the target's tweens (or just the one on attribute) where they are. """
+        for key in [key for key in self.tweens if key[0] is target and attribute in (None, key[1])]:
+            del self.tweens[key]
+
+    def update(self, dt):
+        if not self.tweens:
+            return
+        for key, tween in list(self.tweens.items()):
+            if self.tweens.get(key) is not tween:
+                continue  # Replaced or cancelled by an earlier tween's on_complete
+            if tween.step(dt):
+                # Only remove it if it wasn't replaced while running
+                if self.tweens.get(key) is tween:
+                    del self.tweens[key]
+                if tween.on_complete:
+                    tween.on_complete()
+
+    def is_animating(self, target=None):
+        if target is None:
+            return bool(self.tweens)
+        return any(key[0] is target for key in self.tweens)
+
+    def clear(self):
+        self.tweens.clear()
@@ -1,11 +1,19 @@
 import pygame
+from ui.tween import Tween, ease_out_cubic
 
 
 class UIElement:
     """
     The base class for all UI elements, now with automatic parent registration.
+
+    Pointer events are routed by the UIManager to the interactive elements under the
+    cursor (get_pointer_event, set_hovered), and keyboard events only go to elements
+    with wants_keyboard set. Everything else is still passed down the tree.
     """
 
+    interactive = False  # Indexed in the manager's hit grid to receive pointer events
+    wants_keyboard = False  # Receives KEYDOWN/KEYUP/TEXTINPUT from the manager
+
     def __init__(self, name="", pos=(0, 0), size=(0, 0), parent=None):
         self.name = name
         self.pos = list(pos)
@@ -13,70 +21,105 @@ class UIElement:
         self.parent = parent
         self.children = []
         self.visible = True
+        self.manager = None  # The UIManager indexing this tree, set on the root only
+
+        # Absolute position, recomputed from the parent's and pos when read while dirty
+        self._absolute_pos = [0, 0]
+        self._position_dirty = True
 
         # --- FIX: Automatically register with the parent when created ---
         if self.parent:
             self.parent.add_child(self)
 
-        self.absolute_pos = [0, 0]
-        self._calculate_absolute_pos()
+    @property
+    def absolute_pos(self):
+        if self._position_dirty:
+            if self.parent:
+                parent_pos = self.parent.absolute_pos
+                self._absolute_pos = [parent_pos[0] + self.pos[0], parent_pos[1] + self.pos[1]]
+            else:
+                self._absolute_pos = list(self.pos)
+            self._position_dirty = False
+        return self._absolute_pos
+
+    @absolute_pos.setter
+    def absolute_pos(self, value):
+        """ Places the element directly (as animations do); children follow it. """
+        self._absolute_pos = list(value)
+        self._position_dirty = False
+        if self.interactive:
+            self._position_changed()
+        for child in self.children:
+            child.mark_position_dirty()
+
+    def mark_position_dirty(self):
+        """
+        Has the absolute position recomputed from pos the next time it is read, here and
+        in every descendant. Call after changing pos. A dirty element's descendants are
+        always dirty too, so this stops at subtrees that already are.
+        """
+        if self._position_dirty:
+            return
+        self._position_dirty = True
+        if self.interactive:
+            self._position_changed()
+        for child in self.children:
+            child.mark_position_dirty()
 
-        self.is_animating = False
-        self.start_pos = list(self.absolute_pos)
-        self.target_pos = list(self.absolute_pos)
-        self.anim_timer = 0.0
-        self.anim_duration = 0.0
+    def _position_changed(self):
+        """ Has the manager re-index this element's rect before the next pointer event. """
+        manager = self.get_manager()
+        if manager:
+            manager.mark_moved(self)
 
-    def _calculate_absolute_pos(self):
-        if self.parent:
-            self.absolute_pos[0] = self.parent.absolute_pos[0] + self.pos[0]
-            self.absolute_pos[1] = self.parent.absolute_pos[1] + self.pos[1]
-        else:
-            self.absolute_pos = list(self.pos)
+    def get_rect(self):
+        """ Returns the element's rectangle in screen space. """
+        return pygame.Rect(self.absolute_pos, self.size)
 
-        for child in self.children:
-            child._calculate_absolute_pos()
+    def get_manager(self):
+        """ Returns the UIManager whose tree this element is in, if any. """
+        element = self
+        while element.parent:
+            element = element.parent
+        return element.manager
 
     def add_child(self, child):
         if child not in self.children:
             self.children.append(child)
             # The parent is already set in the child's __init__, so no need to set it again
-
-    def animate_position(self, target_pos, duration):
-        self.start_pos = list(self.absolute_pos)
-        self.target_pos = list(target_pos)
-        self.anim_duration = duration
-        self.anim_timer = 0.0
-        self.is_animating = True
-
-    @staticmethod
-    def ease_out_cubic(t):
-        t -= 1
-        return t * t * t + 1
-
-    def update(self, dt):
-        if self.is_animating:
-            self.anim_timer += dt / 1000.0
-            if self.anim_duration > 0:
-                progress = min(self.anim_timer / self.anim_duration, 1.0)
-                eased_progress = self.ease_out_cubic(progress)
-                self.absolute_pos[0] = self.start_pos[0] + (self.target_pos[0] - self.start_pos[0]) * eased_progress
-                self.absolute_pos[1] = self.start_pos[1] + (self.target_pos[1] - self.start_pos[1]) * eased_progress
-
-                for child in self.children:
-                    child._calculate_absolute_pos()
-
-                if progress >= 1.0:
-                    self.is_animating = False
-            else:
-                self.is_animating = False
-                self.absolute_pos = list(self.target_pos)
-                for child in self.children:
-                    child._calculate_absolute_pos()
-
-        # Update children regardless of parent's animation state
-        for child in self.children:
-            child.update(dt)
+            manager = self.get_manager()
+            if manager:
+                manager.register(child)
+
+    def remove_child(self, child):
+        if child in self.children:
+            self.children.remove(child)
+            manager = self.get_manager()
+            if manager:
+                manager.unregister(child)
+            child.parent = None
+
+    def animate(self, attribute, target, duration, easing=ease_out_cubic, on_complete=None):
+        """
+        Tweens an attribute (a number, or a sequence such as a position or RGBA colour) to
+        target over duration seconds, on the manager's scheduler. easing is a function or
+        a name from ui.tween.EASINGS. Outside a managed tree the value is set at once.
+        """
+        manager = self.get_manager()
+        if manager is None or duration <= 0:
+            setattr(self, attribute, target)
+            if on_complete:
+                on_complete()
+            return
+        manager.tweens.add(Tween(self, attribute, target, duration, easing, on_complete))
+
+    def animate_position(self, target_pos, duration, easing=ease_out_cubic):
+        self.animate("absolute_pos", list(target_pos), duration, easing)
+
+    @property
+    def is_animating(self):
+        manager = self.get_manager()
+        return bool(manager) and manager.tweens.is_animating(self)
 
     def draw(self, surface):
         if not self.visible: return
@@ -89,3 +132,11 @@ class UIElement:
         for child in self.children:
             child.get_event(event)
 
+    def get_pointer_event(self, event):
+        """ Handles a mouse event over this element. Only called on interactive elements. """
+        pass
+
+    def set_hovered(self, hovered):
+        """ Called by the manager when the cursor enters or leaves an interactive element. """
+        pass
+
@@ -1,25 +1,163 @@
+from bisect import bisect_left
+import pygame
 from ui.loader import load_layout_from_figma
+from ui.hit_grid import HitGrid
+from ui.tween import TweenScheduler
+
+POINTER_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+KEYBOARD_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT)
+
+
+def get_tree_path(element):
+    """ Returns the element's child indexes from the root; sorting by these gives tree order. """
+    path = []
+    while element.parent:
+        path.append(element.parent.children.index(element))
+        element = element.parent
+    return path[::-1]
 
 
 class UIManager:
-    """ Manages the state and drawing of all UI elements for a screen. """
+    """
+    Manages the state and drawing of all UI elements for a screen.
+
+    Elements are indexed by name when the layout loads, and UIElement.add_child and
+    remove_child keep the index current, so lookups by name don't search the tree.
+
+    Mouse events don't walk the tree either: interactive elements are kept in a hit
+    grid by their absolute rects, and only the ones under the cursor get the event.
+    Elements that move mark themselves, and are re-indexed before the next mouse event.
+
+    Animations are tweens on the manager's scheduler (UIElement.animate), and update()
+    only advances those, so a UI with nothing moving costs nothing per frame.
+    """
 
     def __init__(self):
         self.root = None
+        self.tweens = TweenScheduler()
+        self.reset_indexes()
+
+    def reset_indexes(self):
+        self.name_index = {}  # name -> every element with that name, in tree order
+        self._sorted_names = None  # Sorted index keys for prefix lookups, rebuilt after changes
+        self.hit_grid = HitGrid()
+        self.interactive_elements = set()
+        self.moved_elements = set()  # Interactive elements to re-index before the next mouse event
+        self.hovered_elements = []
+        self.keyboard_subscribers = []
 
     def load_layout(self, file_path):
         """ Loads a UI layout from a specified Figma JSON file. """
         self.root = load_layout_from_figma(file_path)
+        self.tweens.clear()
+        self.reset_indexes()
+        if self.root:
+            self.root.manager = self
+            self.register(self.root)
+
+    def register(self, element):
+        """ Adds an element and everything under it to the name index. """
+        added = {}  # name -> new elements with that name, in tree order
+        stack = [element]
+        while stack:
+            current = stack.pop()
+            added.setdefault(current.name, []).append(current)
+            if current.interactive:
+                self.interactive_elements.add(current)
+                self.hit_grid.insert(current, current.get_rect())
+            if current.wants_keyboard:
+                self.subscribe_keyboard(current)
+            stack.extend(reversed(current.children))  # Depth-first, in tree order
+
+        # The new subtree is contiguous in the tree, so each name's new elements go in one
+        # place. Children are usually appended, so that is almost always the end of the list.
+        path = None
+        for name, elements in added.items():
+            indexed = self.name_index.setdefault(name, [])
+            index = len(indexed)
+            if indexed:
+                path = path or get_tree_path(element)
+                while index and get_tree_path(indexed[index - 1]) > path:
+                    index -= 1
+            indexed[index:index] = elements
+        self._sorted_names = None
+
+    def unregister(self, element):
+        """ Removes an element and everything under it from the name index. """
+        stack = [element]
+        while stack:
+            current = stack.pop()
+            elements = self.name_index.get(current.name)
+            if elements and current in elements:
+                elements.remove(current)
+                if not elements:
+                    del self.name_index[current.name]
+            self.interactive_elements.discard(current)
+            self.moved_elements.discard(current)
+            self.hit_grid.remove(current)
+            if current in self.hovered_elements:
+                self.hovered_elements.remove(current)
+            self.unsubscribe_keyboard(current)
+            stack.extend(current.children)
+        self._sorted_names = None
+
+    def subscribe_keyboard(self, element):
+        """ Sends keyboard events to the element. """
+        if element not in self.keyboard_subscribers:
+            self.keyboard_subscribers.append(element)
+
+    def unsubscribe_keyboard(self, element):
+        if element in self.keyboard_subscribers:
+            self.keyboard_subscribers.remove(element)
+
+    def mark_moved(self, element):
+        self.moved_elements.add(element)
+
+    def refresh_hit_grid(self):
+        for element in self.moved_elements:
+            if element in self.interactive_elements:
+                self.hit_grid.insert(element, element.get_rect())
+        self.moved_elements.clear()
 
     def get_event(self, event):
-        """ Passes events to the root UI element. """
-        if self.root:
+        """
+        Sends mouse events to the interactive elements under the cursor and keyboard
+        events to subscribers. Other events are passed down the tree.
+        """
+        if not self.root:
+            return
+        if event.type in POINTER_EVENTS:
+            self.dispatch_pointer_event(event)
+        elif event.type in KEYBOARD_EVENTS:
+            for element in list(self.keyboard_subscribers):
+                element.get_event(event)
+        else:
             self.root.get_event(event)
 
+    def dispatch_pointer_event(self, event):
+        if self.moved_elements:
+            self.refresh_hit_grid()
+        targets = [element for element in self.hit_grid.query(event.pos) if element.visible]
+
+        if event.type == pygame.MOUSEMOTION:
+            for element in self.hovered_elements:
+                if element not in targets:
+                    element.set_hovered(False)
+            for element in targets:
+                if element not in self.hovered_elements:
+                    element.set_hovered(True)
+            self.hovered_elements = targets
+
+        for element in targets:
+            element.get_pointer_event(event)
+
     def update(self, dt):
-        """ Updates the root UI element. """
-        if self.root:
-            self.root.update(dt)
+        """ Advances the running animations. """
+        self.tweens.update(dt)
+
+    def is_animating(self):
+        """ Returns True if any element in the tree is mid-animation. """
+        return self.tweens.is_animating()
 
     def draw(self, surface):
         """ Draws the root UI element. """
@@ -28,26 +166,23 @@ class UIManager:
 
     def get_element_by_name(self, name):
         """
-        Finds a specific UI element by its name within the entire UI tree.
+        Finds a UI element by its name. With duplicate names, the first in tree order wins.
         """
-        if not self.root:
-            return None
-
-        # This is a recursive helper function that will search the tree.
-        def find_in_children(element, target_name):
-            # Check if the current element is the one we're looking for
-            if hasattr(element, 'name') and element.name == target_name:
-                return element
-
-            # If not, recursively search through all its children
-            if hasattr(element, 'children'):
-                for child in element.children:
-                    found = find_in_children(child, target_name)
-                    if found:
-                        return found
+        elements = self.name_index.get(name)
+        return elements[0] if elements else None
 
-            # If not found in this branch, return None
-            return None
+    def get_elements_by_name(self, name):
+        """ Returns every element with this name. """
+        return list(self.name_index.get(name, ()))
 
-        return find_in_children(self.root, name)
+    def get_elements_by_prefix(self, prefix):
+        """ Returns every element whose name starts with prefix (e.g. "keybind_"), grouped by name. """
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self.name_index)
+        found = []
+        for name in self._sorted_names[bisect_left(self._sorted_names, prefix):]:
+            if not name.startswith(prefix):
+                break
+            found.extend(self.name_index[name])
+        return found
 
@@ -1,16 +1,23 @@
 import pygame
+import asset_loader
 
 def draw_text(surface, text, center_pos, font, color, alpha=255, outline_width=0, outline_color=(0,0,0), text_rect_origin='center'):
     """
     A powerful text drawing function that handles alpha, alignment, and outlines.
     """
-    # Ensure color has an alpha component for proper fading
-    if len(color) == 3:
-        color = (*color, alpha)
-    else:
-        color = (color[0], color[1], color[2], alpha)
+    # font.render ignores the colour's alpha, so the cache is keyed on RGB alone
+    color = tuple(color[:3])
+
+    # Text on a compositor frame with native text enabled is drawn at output resolution
+    if getattr(surface, "native_text", False) and outline_width == 0:
+        text_surface = asset_loader.render_text(asset_loader.get_native_font(font), str(text), color)
+        text_rect = pygame.Rect((0, 0), get_text_footprint(surface, text_surface))
+        setattr(text_rect, text_rect_origin, center_pos)
+        surface.queue_native_text(text_surface, text_rect.topleft)
+        return
 
-    text_surface = font.render(str(text), True, color)
+    # The cached surface is shared, so it is only ever blitted; the outline is a new surface
+    text_surface = asset_loader.render_text(font, str(text), color)
     text_rect = text_surface.get_rect()
 
     # Handle text alignment
@@ -18,7 +25,7 @@ def draw_text(surface, text, center_pos, font, color, alpha=255, outline_width=0
 
     # Render the outline if requested
     if outline_width > 0:
-        mask = pygame.mask.from_surface(font.render(str(text), True, (255,255,255)))
+        mask = pygame.mask.from_surface(text_surface)
         outline_surface = mask.to_surface(setcolor=outline_color, unsetcolor=(0,0,0,0))
         outline_surface.set_colorkey((0,0,0,0))
         outline_surface.set_alpha(alpha)
@@ -29,3 +36,35 @@ def draw_text(surface, text, center_pos, font, color, alpha=255, outline_width=0
                     surface.blit(outline_surface, (text_rect.x + dx, text_rect.y + dy))
 
     surface.blit(text_surface, text_rect)
+
+
+def blit_static(surface, image, dest):
+    """
+    Blits a surface that never changes once built (a background, a cached banner).
+    On a texture-backed compositor frame it is drawn as a texture uploaded once,
+    anywhere else this is a plain blit.
+    """
+    compositor = getattr(surface, "compositor", None)
+    if compositor is not None and compositor.uses_textures:
+        compositor.draw_texture(image, dest)
+    else:
+        surface.blit(image, dest)
+
+
+def mark_drawn(surface, rect):
+    """
+    Records an area drawn with pygame.draw, which bypasses Surface methods, on surfaces
+    that track their drawn area (the texture compositor's frame). Returns rect.
+    """
+    mark_dirty = getattr(surface, "mark_dirty", None)
+    if mark_dirty:
+        mark_dirty(rect)
+    return rect
+
+
+def get_text_footprint(surface, text_surface):
+    """ Returns the size a rendered text surface covers on the given drawing surface, in its pixels. """
+    if getattr(surface, "native_text", False):
+        scale = surface.compositor.scale
+        return text_surface.get_width() * scale, text_surface.get_height() * scale
+    return text_surface.get_size()